@@ -0,0 +1,118 @@
+"""
+Compact columnar store for large address lists.
+
+A Python str plus a pydantic result per address costs several hundred bytes; at millions of
+rows that's gigabytes. AddressStore keeps one row per address in flat columns instead:
+local parts packed into a single bytes buffer with an offsets array, domains interned
+into an id table (a list has few distinct domains), and outcome/reason as small integers
+with the reason strings interned too. That is roughly 30 bytes per address. Rows are
+rebuilt on demand by the iterators, so output can be streamed without materializing it.
+"""
+
+from array import array
+
+UNCHECKED = 0
+DELIVERABLE = 1
+UNDELIVERABLE = 2  # Valid address that shouldn't be sent to (catch-all, unreachable, ...)
+INVALID = 3
+
+
+def outcome_of(valid, deliverable):
+    if not valid:
+        return INVALID
+    return DELIVERABLE if deliverable else UNDELIVERABLE
+
+
+class AddressStore:
+    """Append-only list of addresses with a validation outcome and reason per row"""
+
+    def __init__(self, emails=()):
+        self._local_parts = bytearray()
+        self._offsets = array("Q", [0])
+        self._domain_ids = array("I")
+        self._domains = []
+        self._domain_index = {}
+        self._outcomes = array("B")
+        self._reason_ids = array("H")
+        self._reasons = [None]  # Reason id 0 is "no reason"
+        self._reason_index = {None: 0}
+        self.extend(emails)
+
+    def _intern_domain(self, domain):
+        domain_id = self._domain_index.get(domain)
+        if domain_id is None:
+            domain_id = self._domain_index[domain] = len(self._domains)
+            self._domains.append(domain)
+        return domain_id
+
+    def _intern_reason(self, reason):
+        reason_id = self._reason_index.get(reason)
+        if reason_id is None:
+            reason_id = self._reason_index[reason] = len(self._reasons)
+            self._reasons.append(reason)
+        return reason_id
+
+    def append(self, email):
+        """Add an address (unchecked) and return its row index"""
+        local_part, _, domain = email.rpartition("@")
+        self._local_parts += local_part.encode("utf-8")
+        self._offsets.append(len(self._local_parts))
+        self._domain_ids.append(self._intern_domain(domain))
+        self._outcomes.append(UNCHECKED)
+        self._reason_ids.append(0)
+        return len(self._domain_ids) - 1
+
+    def extend(self, emails):
+        for email in emails:
+            self.append(email)
+
+    def __len__(self):
+        return len(self._domain_ids)
+
+    def local_part(self, index):
+        return self._local_parts[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    def domain(self, index):
+        return self._domains[self._domain_ids[index]]
+
+    def email(self, index):
+        return f"{self.local_part(index)}@{self.domain(index)}"
+
+    def set_result(self, index, valid, deliverable, reason=None):
+        self._outcomes[index] = outcome_of(valid, deliverable)
+        self._reason_ids[index] = self._intern_reason(reason)
+
+    def outcome(self, index):
+        return self._outcomes[index]
+
+    def reason(self, index):
+        return self._reasons[self._reason_ids[index]]
+
+    def iter_rows(self, start=0, stop=None, outcome=None):
+        """Yield (index, email, outcome, reason) for rows in [start, stop), optionally one outcome only"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        local_parts, offsets = self._local_parts, self._offsets
+        for index in range(start, stop):
+            row_outcome = self._outcomes[index]
+            if outcome is not None and row_outcome != outcome:
+                continue
+            local_part = local_parts[offsets[index]:offsets[index + 1]].decode("utf-8")
+            yield index, f"{local_part}@{self._domains[self._domain_ids[index]]}", row_outcome, self._reasons[self._reason_ids[index]]
+
+    def iter_emails(self, start=0, stop=None):
+        for _, email, _, _ in self.iter_rows(start, stop):
+            yield email
+
+    def counts(self):
+        """Rows per outcome"""
+        counts = [0] * 4
+        for outcome in self._outcomes:
+            counts[outcome] += 1
+        return {"unchecked": counts[UNCHECKED], "deliverable": counts[DELIVERABLE],
+                "undeliverable": counts[UNDELIVERABLE], "invalid": counts[INVALID]}
+
+    def nbytes(self):
+        """Approximate memory held by the columns (interned domain/reason strings excluded)"""
+        return (len(self._local_parts)
+                + sum(column.itemsize * len(column)
+                      for column in (self._offsets, self._domain_ids, self._outcomes, self._reason_ids)))
@@ -0,0 +1,209 @@
+"""
+Hedged asyncio DNS resolver over several nameservers.
+
+A query goes to the nameserver with the best recent p95 latency. If it hasn't answered
+within that p95 (clamped to a sane range), the same query is sent to the next
+nameserver and whichever answers first wins, so one slow or dropped UDP packet costs
+tens of milliseconds instead of a full timeout. A nameserver that errors or SERVFAILs
+hands over to the next immediately. Latencies of answered queries feed the per-server
+stats that set the hedge delay.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+import dns.asyncquery
+import dns.exception
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.resolver
+
+logger = logging.getLogger(__name__)
+
+
+class DNSLookupError(Exception):
+    """Raised when no nameserver produced a usable answer"""
+
+
+class NameserverStats:
+    """Rolling latency and failure counts for one nameserver"""
+
+    def __init__(self, window=200):
+        self.latencies = deque(maxlen=window)
+        self.queries = 0
+        self.failures = 0
+        self.hedged = 0  # Times a hedge query was sent because this server was slow
+
+    def record(self, latency):
+        self.latencies.append(latency)
+
+    def p95(self):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def snapshot(self):
+        p95 = self.p95()
+        return {
+            "queries": self.queries,
+            "failures": self.failures,
+            "hedged": self.hedged,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+def parse_nameservers(value):
+    """Parse "ip[:port],ip[:port]" (IPv6 as [addr]:port) into [(ip, port)]"""
+    nameservers = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if item.startswith("["):
+            host, _, port = item[1:].partition("]")
+            port = port.lstrip(":")
+        elif item.count(":") == 1:
+            host, port = item.split(":")
+        else:
+            host, port = item, ""
+        nameservers.append((host, int(port) if port else 53))
+    return nameservers
+
+
+class HedgedResolver:
+    """Resolve records against several nameservers with hedged requests"""
+
+    def __init__(self, nameservers=None, timeout=5.0, default_hedge_delay=0.2,
+                 min_hedge_delay=0.02, max_hedge_delay=1.0, max_parallel=2):
+        if not nameservers:
+            try:
+                nameservers = [(ip, 53) for ip in dns.resolver.get_default_resolver().nameservers]
+            except dns.resolver.NoResolverConfiguration:
+                logger.warning("No nameservers configured and none found in the system configuration")
+                nameservers = []
+        self.nameservers = list(nameservers)
+        self.timeout = timeout
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.max_parallel = max_parallel
+        self.stats = {nameserver: NameserverStats() for nameserver in self.nameservers}
+
+    def hedge_delay(self, nameserver):
+        p95 = self.stats[nameserver].p95()
+        if p95 is None:
+            return self.default_hedge_delay
+        return min(self.max_hedge_delay, max(self.min_hedge_delay, p95))
+
+    def _ranked_nameservers(self):
+        # Fastest p95 first; servers without samples keep their configured order after those
+        def rank(item):
+            position, nameserver = item
+            p95 = self.stats[nameserver].p95()
+            return (p95 is None, p95 or 0.0, position)
+        return [nameserver for _, nameserver in sorted(enumerate(self.nameservers), key=rank)]
+
+    async def _query_one(self, nameserver, query, timeout):
+        host, port = nameserver
+        stats = self.stats[nameserver]
+        stats.queries += 1
+        started = time.monotonic()
+        try:
+            response = await dns.asyncquery.udp(query, host, port=port, timeout=timeout)
+            if response.flags & dns.flags.TC:
+                response = await dns.asyncquery.tcp(query, host, port=port, timeout=timeout)
+        except (dns.exception.DNSException, OSError) as e:
+            stats.failures += 1
+            raise DNSLookupError(f"{host}:{port} failed: {e or type(e).__name__}") from e
+
+        if response.rcode() not in (dns.rcode.NOERROR, dns.rcode.NXDOMAIN):
+            stats.failures += 1
+            raise DNSLookupError(f"{host}:{port} answered {dns.rcode.to_text(response.rcode())}")
+
+        stats.record(time.monotonic() - started)
+        return response
+
+    async def query(self, name, rdtype):
+        """Return the first usable dns.message response for (name, rdtype)"""
+        query = dns.message.make_query(name, rdtype)
+        candidates = deque(self._ranked_nameservers())
+        if not candidates:
+            raise DNSLookupError("No nameservers configured")
+        deadline = time.monotonic() + self.timeout
+        running = {}
+        errors = []
+
+        def launch():
+            nameserver = candidates.popleft()
+            task = asyncio.create_task(self._query_one(nameserver, query, max(0.0, deadline - time.monotonic())))
+            running[task] = nameserver
+
+        try:
+            launch()
+            while running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                # Wait up to the hedge delay of the newest in-flight server before hedging
+                can_hedge = candidates and len(running) < self.max_parallel
+                wait_for = min(remaining, self.hedge_delay(list(running.values())[-1])) if can_hedge else remaining
+                done, _ = await asyncio.wait(running, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    if can_hedge:
+                        self.stats[list(running.values())[-1]].hedged += 1
+                        launch()
+                    continue
+
+                for task in done:
+                    running.pop(task)
+                    try:
+                        return task.result()
+                    except DNSLookupError as e:
+                        errors.append(str(e))
+                        if candidates:
+                            launch()  # Fail over right away
+        finally:
+            for task in running:
+                task.cancel()
+
+        raise DNSLookupError("; ".join(errors) or f"No answer for {name} within {self.timeout}s")
+
+    async def resolve_mx(self, domain):
+        """MX hosts for a domain ordered by preference; [] when it has none"""
+        response = await self.query(domain, dns.rdatatype.MX)
+        if response.rcode() == dns.rcode.NXDOMAIN:
+            return []
+        records = [
+            rdata for rrset in response.answer if rrset.rdtype == dns.rdatatype.MX for rdata in rrset
+        ]
+        records.sort(key=lambda rdata: rdata.preference)
+        return [str(rdata.exchange) for rdata in records]
+
+    async def resolve_txt(self, name):
+        """TXT strings for a name (multi-string records joined) and the TTL to cache them for
+
+        For NXDOMAIN or an empty answer the TTL is the negative-caching TTL from the SOA in
+        the authority section; None when the answer carries neither.
+        """
+        response = await self.query(name, dns.rdatatype.TXT)
+        records = [
+            b"".join(rdata.strings).decode("utf-8", errors="replace")
+            for rrset in response.answer if rrset.rdtype == dns.rdatatype.TXT for rdata in rrset
+        ]
+        if records:
+            ttls = [rrset.ttl for rrset in response.answer]  # Includes any CNAME hops
+        else:
+            ttls = [
+                min(rrset.ttl, rrset[0].minimum)
+                for rrset in response.authority if rrset.rdtype == dns.rdatatype.SOA
+            ]
+        return records, min(ttls) if ttls else None
+
+    def snapshot(self):
+        return {f"{host}:{port}": self.stats[(host, port)].snapshot() for host, port in self.nameservers}
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Rebuild email_stats_rollup from email_logs.
+
+Run once after deploying the rollup table (and any time the rollup is suspected to have
+drifted). The rebuild replaces the whole rollup in one transaction; pause sending while it
+runs, or logs written concurrently may be counted twice.
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from database import SessionLocal, engine
+from models import EmailStatsRollup
+from email_rollup import backfill_rollup
+
+def main():
+    EmailStatsRollup.__table__.create(bind=engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        rows = backfill_rollup(db)
+        print(f"email_stats_rollup rebuilt: {rows} rows")
+    except Exception as e:
+        db.rollback()
+        print(f"Backfill failed: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
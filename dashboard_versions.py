@@ -0,0 +1,68 @@
+"""
+Per-user versions for caching dashboard and analytics responses.
+
+A user's dashboard numbers only change when their email logs or campaigns do, so cached
+responses are keyed by a per-user version that a Session hook bumps after every commit
+touching that user's EmailLog or Campaign rows (a send, a status update, a delete). Bumping
+after commit rather than at flush means a response computed from uncommitted state is
+never cached under the new version.
+
+Versions live in this process. With several workers, a send handled by one leaves the
+others' entries stale until the cache TTL expires them.
+"""
+
+import threading
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from models import Campaign, EmailLog
+
+_PENDING_USERS = "dashboard_changed_users"  # Session.info key: users changed in this transaction
+
+
+class UserVersions:
+    """Thread-safe per-user change counters"""
+
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        return self._versions.get(user_id, 0)
+
+    def bump(self, user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+
+versions = UserVersions()
+
+
+def _owners(obj):
+    """Current and previous user_id of a changed log or campaign"""
+    history = inspect(obj).attrs.user_id.history
+    return {user_id for user_id in (obj.user_id, *history.deleted) if user_id is not None}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (EmailLog, Campaign)):
+            changed |= _owners(obj)
+    if changed:
+        session.info.setdefault(_PENDING_USERS, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_changed_users(session):
+    changed = session.info.pop(_PENDING_USERS, None)
+    if changed:
+        versions.bump(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop(_PENDING_USERS, None)
@@ -0,0 +1,201 @@
+"""
+Compact, hot-reloadable lookup sets for the validator's domain and prefix lists.
+
+Entries are kept sorted in a single bytes buffer with an offsets array instead of a
+Python set, so lists of hundreds of thousands of domains cost a few bytes of overhead
+per entry. Lookups are a binary search (microseconds). replace() swaps the contents
+atomically, so lists can be reloaded from disk while requests are being served.
+"""
+
+import logging
+import os
+from array import array
+
+logger = logging.getLogger(__name__)
+
+
+class CompactStringSet:
+    """Immutable-per-generation sorted string set with exact-match lookups"""
+
+    def __init__(self, items=()):
+        self._data = self._build(items)
+
+    def _key(self, item):
+        return item.strip().lower()
+
+    def _build(self, items):
+        keys = sorted({key for key in (self._key(item) for item in items) if key})
+        blob = bytearray()
+        offsets = array('I', [0])
+        for key in keys:
+            blob += key.encode('utf-8')
+            offsets.append(len(blob))
+        return bytes(blob), offsets
+
+    def replace(self, items):
+        """Swap in a new set of entries (atomic for concurrent readers)"""
+        self._data = self._build(items)
+
+    def _contains_key(self, data, key):
+        blob, offsets = data
+        lo, hi = 0, len(offsets) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = blob[offsets[mid]:offsets[mid + 1]]
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def _decode(self, key):
+        return key
+
+    def __contains__(self, item):
+        if not isinstance(item, str):
+            return False
+        return self._contains_key(self._data, self._key(item).encode('utf-8'))
+
+    def __len__(self):
+        return len(self._data[1]) - 1
+
+    def __iter__(self):
+        blob, offsets = self._data
+        for i in range(len(offsets) - 1):
+            yield self._decode(blob[offsets[i]:offsets[i + 1]].decode('utf-8'))
+
+
+class DomainSuffixSet(CompactStringSet):
+    """Domain set that also matches subdomains of listed entries
+
+    Domains are stored with their labels reversed ("com.mailinator") and a lookup checks
+    each suffix of the queried domain, so "x.mailinator.com" matches "mailinator.com".
+    """
+
+    def _key(self, item):
+        labels = item.strip().lower().rstrip('.').split('.')
+        return '.'.join(reversed(labels))
+
+    def _decode(self, key):
+        return '.'.join(reversed(key.split('.')))
+
+    def __contains__(self, domain):
+        if not isinstance(domain, str):
+            return False
+        data = self._data
+        reversed_labels = self._key(domain).split('.')
+        for n in range(1, len(reversed_labels) + 1):
+            if self._contains_key(data, '.'.join(reversed_labels[:n]).encode('utf-8')):
+                return True
+        return False
+
+
+def edit_distance(a, b, max_distance):
+    """Optimal string alignment distance (adjacent transpositions count as one edit)
+
+    Returns max_distance + 1 as soon as the distance is known to exceed max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class DomainSuggester:
+    """"Did you mean" lookups for mistyped domains (SymSpell-style deletion index)
+
+    Every domain is indexed under each string obtained by deleting up to max_distance
+    characters. A query generates its own deletes and only the handful of domains sharing
+    one are compared exactly, so a lookup costs microseconds regardless of list size.
+    Domains are ranked by the order they were given in; earlier wins a tie.
+    """
+
+    def __init__(self, domains=(), max_distance=2):
+        self.max_distance = max_distance
+        self._data = self._build(domains)
+
+    def _deletes(self, word, max_distance):
+        deletes = {word}
+        frontier = {word}
+        for _ in range(max_distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+            deletes |= frontier
+        return deletes
+
+    def _build(self, domains):
+        ranks = {}
+        for domain in domains:
+            domain = domain.strip().lower()
+            if domain and domain not in ranks:
+                ranks[domain] = len(ranks)
+
+        index = {}
+        for domain in ranks:
+            for delete in self._deletes(domain, self.max_distance):
+                index.setdefault(delete, []).append(domain)
+        return ranks, index
+
+    def replace(self, domains):
+        """Swap in a new domain list (atomic for concurrent readers)"""
+        self._data = self._build(domains)
+
+    def __len__(self):
+        return len(self._data[0])
+
+    def suggest(self, domain):
+        """Closest listed domain to a domain that isn't listed itself, or None"""
+        ranks, index = self._data
+        domain = domain.strip().lower()
+        if not domain or domain in ranks:
+            return None
+
+        # Short domains get one edit - two would turn too many real domains into something listed
+        max_distance = 1 if len(domain) < 10 else self.max_distance
+        candidates = set()
+        for delete in self._deletes(domain, max_distance):
+            candidates.update(index.get(delete, ()))
+
+        best, best_key = None, None
+        for candidate in candidates:
+            distance = edit_distance(domain, candidate, max_distance)
+            if distance <= max_distance:
+                key = (distance, ranks[candidate])
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+        return best
+
+
+def read_list_file(path):
+    """Read one entry per line, skipping blank lines and '#' comments"""
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            entry = line.split('#', 1)[0].strip()
+            if entry:
+                entries.append(entry)
+    return entries
+
+
+def reload_lists(list_files):
+    """Reload each (lookup set, path) pair; sets whose file is missing keep their contents"""
+    counts = {}
+    for name, (lookup_set, path) in list_files.items():
+        if not os.path.exists(path):
+            logger.warning(f"Domain list file not found, keeping current entries: {path}")
+            counts[name] = len(lookup_set)
+            continue
+        lookup_set.replace(read_list_file(path))
+        counts[name] = len(lookup_set)
+    return counts
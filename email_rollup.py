@@ -0,0 +1,134 @@
+"""
+Hourly email counts maintained alongside email_logs.
+
+Every EmailLog insert, status (or owner/timestamp) change and ORM delete adjusts
+email_stats_rollup in the same transaction, from a Session after_flush hook. Dashboards
+sum the rollup instead of scanning raw logs, so their cost grows with the number of
+hours and campaigns, not with the number of emails.
+
+Rollup rows are additive: an adjustment updates the row for its key or inserts one, and
+readers always SUM(count). Two transactions racing to create the same key leave two
+rows, which sum to the right total. Bulk query deletes bypass the hook - use
+delete_email_logs() for those.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import delete, event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from models import EmailLog, EmailStatsRollup
+
+ROLLUP_KEY_ATTRIBUTES = ("user_id", "campaign_id", "sent_at", "status")
+
+
+def hour_bucket(moment):
+    return moment.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def _rollup_key(user_id, campaign_id, sent_at, status):
+    return user_id, campaign_id, hour_bucket(sent_at or datetime.utcnow()), status
+
+
+def _previous_value(state, attribute):
+    history = state.attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, attribute)
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+# An assignment to an expired attribute doesn't load the old value by default, which would
+# leave no history to subtract; active_history makes the ORM load it first
+for _attribute in ROLLUP_KEY_ATTRIBUTES:
+    event.listen(getattr(EmailLog, _attribute), "set", _load_previous_value, active_history=True, retval=True)
+
+
+def apply_rollup_deltas(connection, deltas):
+    """Add each {(user_id, campaign_id, bucket_hour, status): delta} to the rollup"""
+    table = EmailStatsRollup.__table__
+    for (user_id, campaign_id, bucket_hour, status), delta in deltas.items():
+        if not delta:
+            continue
+        key = (
+            table.c.user_id.is_(None) if user_id is None else table.c.user_id == user_id,
+            table.c.campaign_id.is_(None) if campaign_id is None else table.c.campaign_id == campaign_id,
+            table.c.bucket_hour == bucket_hour,
+            table.c.status == status,
+        )
+        # Adjust a single row for the key (the lowest id) so racing duplicates stay harmless
+        row_id = connection.execute(select(func.min(table.c.id)).where(*key)).scalar()
+        if row_id is not None:
+            connection.execute(update(table).where(table.c.id == row_id).values(count=table.c.count + delta))
+            if delta < 0:
+                # Keys whose logs are all gone (deleted or moved to another status) drop out
+                connection.execute(delete(table).where(table.c.id == row_id, table.c.count == 0))
+        else:
+            connection.execute(insert(table).values(user_id=user_id, campaign_id=campaign_id,
+                                                    bucket_hour=bucket_hour, status=status, count=delta))
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_rollup(session, flush_context):
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, EmailLog):
+            deltas[_rollup_key(obj.user_id, obj.campaign_id, obj.sent_at, obj.status)] += 1
+
+    for obj in session.dirty:
+        if not isinstance(obj, EmailLog):
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[attribute].history.has_changes() for attribute in ROLLUP_KEY_ATTRIBUTES):
+            continue
+        deltas[_rollup_key(*(_previous_value(state, attribute) for attribute in ROLLUP_KEY_ATTRIBUTES))] -= 1
+        deltas[_rollup_key(obj.user_id, obj.campaign_id, obj.sent_at, obj.status)] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, EmailLog):
+            deltas[_rollup_key(*(_previous_value(inspect(obj), attribute) for attribute in ROLLUP_KEY_ATTRIBUTES))] -= 1
+
+    if deltas:
+        apply_rollup_deltas(session.connection(), deltas)
+
+
+def _bucket_expression(dialect_name):
+    if dialect_name == "postgresql":
+        return func.date_trunc("hour", EmailLog.sent_at)
+    # Same text format SQLAlchemy stores SQLite DateTime values in, so buckets compare as equal
+    return func.strftime("%Y-%m-%d %H:00:00.000000", EmailLog.sent_at)
+
+
+def _grouped_counts(db, *criteria):
+    bucket = _bucket_expression(db.get_bind().dialect.name).label("bucket_hour")
+    return (db.query(EmailLog.user_id, EmailLog.campaign_id, bucket, EmailLog.status, func.count(EmailLog.id))
+            .filter(*criteria)
+            .group_by(EmailLog.user_id, EmailLog.campaign_id, bucket, EmailLog.status))
+
+
+def delete_email_logs(db, *criteria, keep_stats=False):
+    """Bulk-delete logs matching criteria, taking their counts out of the rollup unless keep_stats"""
+    if not keep_stats:
+        deltas = Counter()
+        for user_id, campaign_id, bucket_hour, status, count in _grouped_counts(db, *criteria):
+            if isinstance(bucket_hour, str):
+                bucket_hour = datetime.fromisoformat(bucket_hour)
+            deltas[(user_id, campaign_id, bucket_hour, status)] -= count
+        apply_rollup_deltas(db.connection(), deltas)
+    return db.query(EmailLog).filter(*criteria).delete(synchronize_session=False)
+
+
+def backfill_rollup(db):
+    """Rebuild the rollup from email_logs in one statement; returns the number of rollup rows"""
+    db.query(EmailStatsRollup).delete()
+    bucket = _bucket_expression(db.get_bind().dialect.name)
+    grouped = (select(EmailLog.user_id, EmailLog.campaign_id, bucket, EmailLog.status, func.count(EmailLog.id))
+               .group_by(EmailLog.user_id, EmailLog.campaign_id, bucket, EmailLog.status))
+    db.execute(insert(EmailStatsRollup.__table__).from_select(
+        ["user_id", "campaign_id", "bucket_hour", "status", "count"], grouped))
+    db.commit()
+    return db.query(func.count(EmailStatsRollup.id)).scalar()
@@ -0,0 +1,115 @@
+"""
+Set operations over address lists too large to hold in memory.
+
+Stored lists are files of normalized addresses, one per line, sorted and deduplicated.
+Union, intersection and difference are then single streaming merges over the operand
+files. Unsorted input (uploads, bounce addresses) goes through an external sort: runs
+of at most run_size addresses are sorted in memory and spilled to temporary files, then
+k-way merged, so memory is bounded by the run size whatever the list length.
+"""
+
+import heapq
+import os
+import tempfile
+
+EXTERNAL_SORT_RUN_SIZE = 200000  # Addresses sorted in memory per spilled run
+
+
+def unique(sorted_addresses):
+    """Drop adjacent duplicates from a sorted stream"""
+    previous = None
+    for address in sorted_addresses:
+        if address != previous:
+            yield address
+            previous = address
+
+
+def _spill(run, directory):
+    run.sort()
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".run", delete=False) as f:
+        f.writelines(f"{address}\n" for address in unique(run))
+        return f.name
+
+
+def read_sorted(path):
+    """Stream the addresses of a sorted list file"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def external_sort(addresses, directory=None, run_size=EXTERNAL_SORT_RUN_SIZE):
+    """Yield addresses sorted and deduplicated, spilling sorted runs to disk as needed"""
+    run = []
+    run_paths = []
+    try:
+        for address in addresses:
+            run.append(address)
+            if len(run) >= run_size:
+                run_paths.append(_spill(run, directory))
+                run = []
+
+        if not run_paths:
+            run.sort()
+            yield from unique(run)
+            return
+
+        if run:
+            run_paths.append(_spill(run, directory))
+            run = []
+        yield from unique(heapq.merge(*(read_sorted(path) for path in run_paths)))
+    finally:
+        for path in run_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def union(*streams):
+    return unique(heapq.merge(*streams))
+
+
+def intersection(first, *others):
+    """Addresses present in every sorted stream"""
+    iterators = [iter(stream) for stream in (first, *others)]
+    try:
+        heads = [next(it) for it in iterators]
+        while True:
+            highest = max(heads)
+            if all(head == highest for head in heads):
+                yield highest
+                heads = [next(it) for it in iterators]
+                continue
+            # Advance every stream that is behind the highest head
+            for i, it in enumerate(iterators):
+                while heads[i] < highest:
+                    heads[i] = next(it)
+    except StopIteration:
+        return
+
+
+def difference(first, *others):
+    """Addresses of the first sorted stream that are in none of the others"""
+    removed = iter(union(*others))
+    current = next(removed, None)
+    for address in first:
+        while current is not None and current < address:
+            current = next(removed, None)
+        if address != current:
+            yield address
+
+
+OPERATIONS = {"union": union, "intersection": intersection, "difference": difference}
+
+
+def write_sorted(path, addresses):
+    """Write a sorted stream atomically to path and return the number of addresses"""
+    count = 0
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        for address in addresses:
+            f.write(f"{address}\n")
+            count += 1
+    os.replace(temp_path, path)
+    return count
@@ -1,7 +1,5 @@
 import os
 import json
-import dns.resolver
-import smtplib
 import asyncio
 from dotenv import load_dotenv
 import uuid
@@ -11,7 +9,12 @@ import time
 from datetime import datetime, timedelta, timezone
 import hashlib
 import secrets
+import csv
+import io
+import shutil
+import tempfile
 from contextlib import asynccontextmanager
+from ttl_cache import TTLCache
 
 load_dotenv()
 
@@ -62,10 +65,10 @@ def sanitize_username_for_logging(username):
         sanitized = sanitized[:47] + "..."
     return sanitized or "<invalid>"
 
-# Rate limiting storage
-login_attempts = {}
-email_attempts = {}
-active_sessions = {}  # Track active user sessions: {session_id: {user_id, username, login_time, last_activity, ip}}
+# Rate limiting storage - bounded, and entries expire on their own instead of waiting for an admin sweep
+login_attempts = TTLCache(max_size=50000, ttl=86400, name="login_attempts")  # Kept 24h for the security dashboard
+email_attempts = TTLCache(max_size=50000, ttl=3600, name="email_attempts")  # Only the last hour counts
+active_sessions = TTLCache(max_size=50000, ttl=86400, name="active_sessions")  # Track active user sessions: {session_id: {user_id, username, login_time, last_activity, ip}}
 security_alerts = []  # Track security events
 active_tokens = set()  # Track valid JWT tokens
 user_activity_log = []  # Track user activities: {user_id, username, action, timestamp, ip, details}
@@ -96,11 +99,11 @@ MAX_EMAILS_PER_HOUR = 10000  # Generous limit for paid plans
 # Email validation regex pattern (improved)
 EMAIL_VALIDATION_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, status, Request, UploadFile, File
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import or_, select, func, text
+from sqlalchemy import and_, case, func, text, true
 from sqlalchemy.exc import IntegrityError, OperationalError
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -110,13 +113,16 @@ from sendgrid.helpers.mail import Mail
 from authlib.integrations.starlette_client import OAuth
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.config import Config
-from starlette.responses import RedirectResponse
+from starlette.responses import RedirectResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 import uvicorn
 import requests
 
 from database import SessionLocal, engine
 from typing import List
-from models import Base, User as DBUser, Template, Campaign, EmailLog, ChatMessage, UserEmail
+from models import Base, User as DBUser, Template, Campaign, EmailLog, EmailStatsRollup, ChatMessage, UserEmail, ValidationJob, RecipientList
+from email_rollup import delete_email_logs, hour_bucket
+from dashboard_versions import versions as dashboard_versions
 from schemas import (
     EmailRequest, User as UserSchema, UserUpdate, AdminUserCreate, AdminUserUpdate, UserPasswordUpdate,
     Template as TemplateSchema, TemplateCreate, TemplateUpdate, AdminTemplateCreate, AdminTemplateUpdate,
@@ -124,7 +130,9 @@ from schemas import (
     EmailLog as EmailLogSchema, EmailLogCreate,
     DashboardStats, EmailStats, EmailValidationRequest, EmailValidationResponse, EmailValidationResult, EmailGenerationRequest, EmailGenerationResponse,
     ComprehensiveAnalytics, EmailStatusStats, DeliveryStats, TimeBasedStats,
-    ChatMessage as ChatMessageSchema, ChatMessageCreate, ChatHistoryResponse
+    ChatMessage as ChatMessageSchema, ChatMessageCreate, ChatHistoryResponse,
+    ValidationJob as ValidationJobSchema,
+    RecipientList as RecipientListSchema, RecipientListCombine
 )
 
 # Lifespan event handler for proper cleanup
@@ -132,10 +140,11 @@ from schemas import (
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Application starting up")
+    start_validation_job_workers()
     yield
     # Shutdown
     logger.info("Application shutting down")
-    cleanup_thread_pool()
+    await stop_validation_job_workers()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -375,56 +384,62 @@ def delete_user(user_id: int, db: Session = Depends(get_db), admin: DBUser = Dep
 
 # --- Dashboard and Analytics Endpoints ---
 
+# Dashboard counts come from email_stats_rollup (hourly counts kept in step with email_logs by
+# email_rollup), so rolling windows are resolved to the hour
+def count_email_logs(db, owner_filter=None, **conditions):
+    """Sum rollup counts matching each named condition in a single query (conditional aggregation)"""
+    columns = [func.coalesce(func.sum(case((condition, EmailStatsRollup.count), else_=0)), 0).label(name)
+               for name, condition in conditions.items()]
+    query = db.query(*columns)
+    if owner_filter is not None:
+        query = query.filter(owner_filter)
+    return query.one()._mapping
+
+# Dashboard responses are cached per user until their logs or campaigns change (see
+# dashboard_versions) and per hour, the resolution of the rolling windows. Browsers revalidate
+# with If-None-Match on every auto-refresh and get a 304 while nothing has changed
+DASHBOARD_CACHE_TTL = 900  # 15 minutes - bounds staleness when another worker handled the change
+DASHBOARD_CACHE_MAX_SIZE = 10000
+dashboard_cache = TTLCache(max_size=DASHBOARD_CACHE_MAX_SIZE, ttl=DASHBOARD_CACHE_TTL, name="dashboard")
+
+def cached_dashboard_response(request, endpoint, user_id, build):
+    """Serve build()'s response model from the per-user cache with an ETag, or 304 if the client has it"""
+    # Read the version before building, so a change committed meanwhile misses next time
+    key = (endpoint, user_id, dashboard_versions.get(user_id), hour_bucket(datetime.utcnow()))
+    cached = dashboard_cache.get(key)
+    if cached is None:
+        body = build().model_dump_json().encode("utf-8")
+        cached = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        dashboard_cache.set(key, cached)
+    body, etag = cached
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @app.get("/dashboard/stats", response_model=DashboardStats)
-def get_dashboard_stats(db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
-    now = datetime.now(timezone.utc)
+def get_dashboard_stats(request: Request, db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    return cached_dashboard_response(request, "dashboard_stats", current_user.id,
+                                     lambda: compute_dashboard_stats(db, current_user))
+
+def compute_dashboard_stats(db, current_user):
+    now = datetime.utcnow()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
+    week_ago = hour_bucket(now - timedelta(days=7))
+    month_ago = hour_bucket(now - timedelta(days=30))
     month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-    # Email stats - include both campaign emails and individual emails
-    # Get all campaign IDs for this user using safe query with proper validation
-    user_campaigns = db.query(Campaign.id).filter(Campaign.user_id == current_user.id).all()
-    campaign_ids = [c.id for c in user_campaigns if isinstance(c.id, int)]
-
-    # Build query safely with proper parameterization
-    def get_email_count(start_date, campaign_ids, user_id):
-        # Validate user_id to prevent injection
-        if not isinstance(user_id, int) or user_id <= 0:
-            return 0
-            
-        base_query = db.query(func.count(EmailLog.id)).filter(
-            EmailLog.sent_at >= start_date,
-            EmailLog.status == "sent"
-        )
-
-        if campaign_ids:
-            # Validate all campaign IDs are integers
-            validated_campaign_ids = [cid for cid in campaign_ids if isinstance(cid, int) and cid > 0]
-            if validated_campaign_ids:
-                return base_query.filter(
-                    or_(
-                        EmailLog.campaign_id.in_(validated_campaign_ids),
-                        EmailLog.user_id == user_id
-                    )
-                ).scalar() or 0
-            else:
-                return base_query.filter(EmailLog.user_id == user_id).scalar() or 0
-        else:
-            return base_query.filter(EmailLog.user_id == user_id).scalar() or 0
-
-    today_count = get_email_count(today_start, campaign_ids, current_user.id)
-    week_count = get_email_count(week_ago, campaign_ids, current_user.id)
-    month_count = get_email_count(month_ago, campaign_ids, current_user.id)
-    this_month_count = get_email_count(month_start, campaign_ids, current_user.id)
-
-    email_stats = EmailStats(
-        today=today_count,
-        last_7_days=week_count,
-        last_30_days=month_count,
-        this_month=this_month_count
+    # Email stats - include both campaign emails and individual emails, every window in one query
+    sent = EmailStatsRollup.status == "sent"
+    counts = count_email_logs(
+        db, EmailStatsRollup.user_id == current_user.id,
+        today=and_(sent, EmailStatsRollup.bucket_hour >= today_start),
+        last_7_days=and_(sent, EmailStatsRollup.bucket_hour >= week_ago),
+        last_30_days=and_(sent, EmailStatsRollup.bucket_hour >= month_ago),
+        this_month=and_(sent, EmailStatsRollup.bucket_hour >= month_start),
     )
+    email_stats = EmailStats(**counts)
 
     # Total campaigns
     total_campaigns = db.query(Campaign).filter(Campaign.user_id == current_user.id).count()
@@ -441,18 +456,7 @@ def get_dashboard_stats(db: Session = Depends(get_db), current_user: DBUser = De
 @app.get("/dashboard/recent-emails")
 def get_recent_emails(db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
     """Get recent 10 emails for regular users"""
-    user_campaigns = db.query(Campaign.id).filter(Campaign.user_id == current_user.id).all()
-    user_campaign_ids = [c.id for c in user_campaigns if isinstance(c.id, int) and c.id > 0]
-    
-    if user_campaign_ids:
-        query = db.query(EmailLog).filter(
-            or_(
-                EmailLog.user_id == current_user.id,
-                EmailLog.campaign_id.in_(user_campaign_ids)
-            )
-        )
-    else:
-        query = db.query(EmailLog).filter(EmailLog.user_id == current_user.id)
+    query = db.query(EmailLog).filter(EmailLog.user_id == current_user.id)
     
     emails = query.order_by(EmailLog.sent_at.desc()).limit(10).all()
     return [{
@@ -479,55 +483,37 @@ def get_admin_recent_emails(db: Session = Depends(get_db), current_user: DBUser
 # --- Comprehensive Analytics Endpoint ---
 
 @app.get("/analytics", response_model=ComprehensiveAnalytics)
-def get_comprehensive_analytics(db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
-    now = datetime.now(timezone.utc)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-    # Get all campaign IDs for this user with proper validation
-    user_campaigns = db.query(Campaign.id).filter(Campaign.user_id == current_user.id).all()
-    user_campaign_ids = [c.id for c in user_campaigns if isinstance(c.id, int) and c.id > 0]
-
-    # Helper function to get status counts for a time period
-    def get_status_counts(start_date):
-        # Use proper parameterized query with safe aggregation
-        def get_count(status):
-            # Validate user_id to prevent injection
-            if not isinstance(current_user.id, int) or current_user.id <= 0:
-                return 0
-                
-            base_query = db.query(func.count(EmailLog.id)).filter(
-                EmailLog.sent_at >= start_date
-            )
-            if user_campaign_ids:
-                base_query = base_query.filter(
-                    or_(
-                        EmailLog.campaign_id.in_(user_campaign_ids),
-                        EmailLog.user_id == current_user.id
-                    )
-                )
-            else:
-                base_query = base_query.filter(EmailLog.user_id == current_user.id)
-
-            if status:
-                # Validate status parameter
-                if status not in ['sent', 'failed', 'bounced']:
-                    return 0
-                base_query = base_query.filter(EmailLog.status == status)
-
-            return base_query.scalar() or 0
-
-        sent = get_count("sent")
-        failed = get_count("failed")
-        bounced = get_count("bounced")
-        total = get_count(None)
+def get_comprehensive_analytics(request: Request, db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    return cached_dashboard_response(request, "analytics", current_user.id,
+                                     lambda: compute_comprehensive_analytics(db, current_user))
+
+def compute_comprehensive_analytics(db, current_user):
+    now = datetime.utcnow()
+    windows = {
+        "all_time": None,
+        "today": now.replace(hour=0, minute=0, second=0, microsecond=0),
+        "last_7_days": hour_bucket(now - timedelta(days=7)),
+        "last_30_days": hour_bucket(now - timedelta(days=30)),
+        "this_month": now.replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+    }
 
-        return EmailStatusStats(sent=sent, failed=failed, bounced=bounced, total=total)
+    # Every window x status, plus the campaign/individual split, in one pass over the user's rollup rows
+    conditions = {}
+    for window, start_date in windows.items():
+        in_window = EmailStatsRollup.bucket_hour >= start_date if start_date is not None else true()
+        conditions[f"{window}_total"] = in_window
+        for status_name in ("sent", "failed", "bounced"):
+            conditions[f"{window}_{status_name}"] = and_(in_window, EmailStatsRollup.status == status_name)
+    conditions["campaign_emails"] = EmailStatsRollup.campaign_id.isnot(None)
+    conditions["individual_emails"] = EmailStatsRollup.campaign_id.is_(None)
+    counts = count_email_logs(db, EmailStatsRollup.user_id == current_user.id, **conditions)
+
+    def status_counts(window):
+        return EmailStatusStats(sent=counts[f"{window}_sent"], failed=counts[f"{window}_failed"],
+                                bounced=counts[f"{window}_bounced"], total=counts[f"{window}_total"])
 
     # Get overall statistics
-    all_time = get_status_counts(datetime.min)  # All emails
+    all_time = status_counts("all_time")
 
     # Calculate delivery stats
     total_emails = all_time.total
@@ -546,32 +532,19 @@ def get_comprehensive_analytics(db: Session = Depends(get_db), current_user: DBU
 
     # Time-based statistics
     time_based = TimeBasedStats(
-        today=get_status_counts(today_start),
-        last_7_days=get_status_counts(week_ago),
-        last_30_days=get_status_counts(month_ago),
-        this_month=get_status_counts(month_start)
+        today=status_counts("today"),
+        last_7_days=status_counts("last_7_days"),
+        last_30_days=status_counts("last_30_days"),
+        this_month=status_counts("this_month")
     )
 
-    # Campaign vs Individual emails with proper parameterization
-    if user_campaign_ids:
-        campaign_emails = db.query(EmailLog).filter(
-            EmailLog.campaign_id.in_(user_campaign_ids)
-        ).count()
-    else:
-        campaign_emails = 0
-
-    individual_emails = db.query(EmailLog).filter(
-        EmailLog.user_id == current_user.id,
-        EmailLog.campaign_id.is_(None)
-    ).count()
-
     return ComprehensiveAnalytics(
         total_emails=total_emails,
         status_breakdown=all_time,
         delivery_stats=delivery_stats,
         time_based=time_based,
-        campaign_emails=campaign_emails,
-        individual_emails=individual_emails
+        campaign_emails=counts["campaign_emails"],
+        individual_emails=counts["individual_emails"]
     )
 
 # --- Chat Endpoints ---
@@ -894,8 +867,8 @@ def delete_admin_campaign(campaign_id: int, db: Session = Depends(get_db), curre
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    # Delete associated email logs first
-    db.query(EmailLog).filter(EmailLog.campaign_id == campaign_id).delete()
+    # Delete associated email logs (and their rollup counts) first
+    delete_email_logs(db, EmailLog.campaign_id == campaign_id)
 
     # Delete the campaign
     db.delete(campaign)
@@ -937,9 +910,9 @@ def cleanup_system_data(data: dict, db: Session = Depends(get_db), current_user:
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=2)
         deleted_count = db.query(ChatMessage).filter(ChatMessage.created_at < cutoff_date).delete()
     elif cleanup_type == "email_logs":
-        # Delete logs older than 30 days
+        # Delete logs older than 30 days; their counts stay in the rollup for the dashboards
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=30)
-        deleted_count = db.query(EmailLog).filter(EmailLog.sent_at < cutoff_date).delete()
+        deleted_count = delete_email_logs(db, EmailLog.sent_at < cutoff_date, keep_stats=True)
 
     db.commit()
     return {"message": f"Cleaned up {deleted_count} records"}
@@ -971,14 +944,16 @@ def get_admin_overview(db: Session = Depends(get_db), current_user: DBUser = Dep
     active_campaigns = db.query(func.count(Campaign.id)).filter(Campaign.status == 'sending').scalar()
     total_campaigns = db.query(func.count(Campaign.id)).scalar()
     
-    # Get emails sent today
-    emails_today = db.query(func.count(EmailLog.id)).filter(
-        EmailLog.sent_at >= today,
-        EmailLog.status == 'sent'
-    ).scalar()
+    # Get emails sent today, and all of today's emails for the success rate
+    today_counts = count_email_logs(
+        db,
+        sent=and_(EmailStatsRollup.bucket_hour >= today.replace(tzinfo=None), EmailStatsRollup.status == 'sent'),
+        total=EmailStatsRollup.bucket_hour >= today.replace(tzinfo=None),
+    )
+    emails_today = today_counts["sent"]
     
     # Calculate success rate for today's emails
-    total_emails_today = db.query(func.count(EmailLog.id)).filter(EmailLog.sent_at >= today).scalar()
+    total_emails_today = today_counts["total"]
     if total_emails_today > 0:
         success_rate = round((emails_today / total_emails_today) * 100, 1)
     else:
@@ -1039,10 +1014,12 @@ def get_email_logs(
     if status_filter and status_filter != 'all':
         query = query.filter(EmailLog.status == status_filter)
 
-    # Get stats
-    total_sent = db.query(func.count(EmailLog.id)).filter(EmailLog.status == 'sent').scalar()
-    total_failed = db.query(func.count(EmailLog.id)).filter(EmailLog.status == 'failed').scalar()
-    total_bounced = db.query(func.count(EmailLog.id)).filter(EmailLog.status == 'bounced').scalar()
+    # Lifetime totals from the rollup, which keeps the counts of logs removed by cleanup - so
+    # they can exceed what the log list shows (reported as stats_scope)
+    status_counts = count_email_logs(db, **{name: EmailStatsRollup.status == name for name in ('sent', 'failed', 'bounced')})
+    total_sent = status_counts['sent']
+    total_failed = status_counts['failed']
+    total_bounced = status_counts['bounced']
     total_all = total_sent + total_failed + total_bounced
 
     # Get logs with pagination (ensure user relationship is loaded)
@@ -1055,6 +1032,7 @@ def get_email_logs(
             "bounced": total_bounced,
             "total": total_all
         },
+        "stats_scope": "lifetime",
         "logs": [{
             "id": log.id,
             "user_id": log.user_id,
@@ -1584,207 +1562,572 @@ def update_template_admin(template_id: str, template_update: AdminTemplateUpdate
 
 # ULTRA-FAST Email Validation with Caching and Parallel Processing
 import aiohttp
-from concurrent.futures import ThreadPoolExecutor
-import threading
+from smtp_probe import SMTPProber
+from async_resolver import DNSLookupError, HedgedResolver, parse_nameservers
+from sender_auth import DEFAULT_DKIM_SELECTORS, SenderAuthChecker
+from domain_lists import CompactStringSet, DomainSuffixSet, DomainSuggester, read_list_file, reload_lists
+from validation_governor import ValidationGovernor, ValidationSaturated
+from list_algebra import OPERATIONS as LIST_OPERATIONS, external_sort, read_sorted, union as list_union, write_sorted
+from address_store import DELIVERABLE, INVALID, UNDELIVERABLE, AddressStore
 
 # Global DNS cache with TTL and size limits
-dns_cache = {}
-dns_cache_lock = threading.Lock()
 DNS_CACHE_TTL = 3600  # 1 hour
 DNS_CACHE_MAX_SIZE = 10000  # Maximum cache entries
+dns_cache = TTLCache(max_size=DNS_CACHE_MAX_SIZE, ttl=DNS_CACHE_TTL, name="dns")
+
+# Address-level validation results, keyed by normalized email. TTL depends on the outcome:
+# a missing MX record rarely changes, an unreachable SMTP server often does. Reasons not
+# listed here come from instant checks and aren't worth caching
+RESULT_CACHE_MAX_SIZE = 100000  # Maximum cached addresses
+result_cache = TTLCache(max_size=RESULT_CACHE_MAX_SIZE, name="validation_results")
+RESULT_CACHE_TTLS = {
+    "Invalid Domain (No MX Record)": 7 * 86400,
+    "Mailbox Verified": 7 * 86400,
+    "Mailbox Not Found": 3 * 86400,
+    "Domain Valid (Catch-all)": 3 * 86400,
+    "Domain Valid (SMTP Blocked)": 86400,
+    "Role-based / non-personal": 86400,
+    "SMTP unreachable – possibly valid": 900,  # 15 minutes
+    "Greylisted – possibly valid": 900,
+}
+# A DNS lookup that failed (timeout, SERVFAIL) rather than came back empty; never cached
+DNS_FAILED_REASON = "DNS lookup failed – possibly valid"
+
+# Per-domain catch-all status, stored next to the MX cache and shared across sessions and requests
+CATCH_ALL_CACHE_TTL = 86400  # 24 hours - catch-all is a stable property of the domain
+catch_all_cache = TTLCache(max_size=DNS_CACHE_MAX_SIZE, ttl=CATCH_ALL_CACHE_TTL, name="catch_all")
+
+# Process-wide validation limits shared by every request and bulk job. Contended slots are
+# shared fairly between users; interactive requests beyond the pending bounds get a 429
+VALIDATION_MAX_DNS_LOOKUPS = int(os.getenv("VALIDATION_MAX_DNS_LOOKUPS", 20))
+VALIDATION_MAX_SMTP_SESSIONS = int(os.getenv("VALIDATION_MAX_SMTP_SESSIONS", 100))
+VALIDATION_MAX_PENDING = int(os.getenv("VALIDATION_MAX_PENDING", 20000))  # Addresses in flight across requests
+VALIDATION_MAX_PENDING_PER_USER = int(os.getenv("VALIDATION_MAX_PENDING_PER_USER", 5000))
+VALIDATION_RETRY_AFTER = int(os.getenv("VALIDATION_RETRY_AFTER", 5))  # Seconds suggested to rejected callers
+
+validation_governor = ValidationGovernor(
+    max_dns_lookups=VALIDATION_MAX_DNS_LOOKUPS,
+    max_smtp_sessions=VALIDATION_MAX_SMTP_SESSIONS,
+    max_pending=VALIDATION_MAX_PENDING,
+    max_pending_per_user=VALIDATION_MAX_PENDING_PER_USER,
+    retry_after=VALIDATION_RETRY_AFTER,
+)
 
-# Thread pool for DNS lookups with proper cleanup
-dns_executor = ThreadPoolExecutor(max_workers=20, thread_name_prefix="dns-lookup")
+# MX lookups go straight to the nameservers in DNS_NAMESERVERS ("ip[:port],..."; the system
+# resolvers when unset). Slow queries are hedged to a second nameserver after its p95 latency
+DNS_NAMESERVERS = parse_nameservers(os.getenv("DNS_NAMESERVERS", ""))
+DNS_LOOKUP_TIMEOUT = 5.0  # Seconds across all nameservers before a lookup counts as failed
+
+dns_resolver = HedgedResolver(nameservers=DNS_NAMESERVERS, timeout=DNS_LOOKUP_TIMEOUT)
+
+# Sender-domain SPF/DKIM/DMARC checks share the resolver; TXT answers are cached for their DNS TTL.
+# /api/send-email logs a warning for From domains that look set to fail DMARC alignment. DKIM keys
+# are only found on known selectors (add custom ones via SENDER_DKIM_SELECTORS), so refusing
+# such sends with SENDER_AUTH_ENFORCE=true is opt-in
+SENDER_AUTH_ENFORCE = os.getenv("SENDER_AUTH_ENFORCE", "false").lower() == "true"
+SENDER_DKIM_SELECTORS = [s.strip() for s in os.getenv("SENDER_DKIM_SELECTORS", "").split(",") if s.strip()]
+SENDER_SPF_INCLUDES = ("sendgrid.net",)  # What an SPF record includes to authorize SendGrid
+
+sender_auth_cache = TTLCache(max_size=DNS_CACHE_MAX_SIZE, name="sender_auth")
+sender_auth = SenderAuthChecker(
+    dns_resolver, sender_auth_cache,
+    dkim_selectors=SENDER_DKIM_SELECTORS or DEFAULT_DKIM_SELECTORS,
+    service_spf_includes=SENDER_SPF_INCLUDES,
+)
 
-# Cleanup function for thread pool
-def cleanup_thread_pool():
-    """Cleanup thread pool on shutdown"""
-    try:
-        if dns_executor:
-            dns_executor.shutdown(wait=True)
-            logger.info("DNS thread pool cleaned up")
-    except Exception as e:
-        logger.error(f"Error cleaning up DNS thread pool: {e}")
 
+# Domain and prefix lists are loaded from DOMAIN_LISTS_DIR into compact sorted sets and can be
+# hot-reloaded via /admin/validation/domain-lists/reload without a restart
+DOMAIN_LISTS_DIR = os.getenv("DOMAIN_LISTS_DIR", "data")
 
 # Known valid domains - pre-validated to skip DNS lookups
-KNOWN_VALID_DOMAINS = {
-    # Major providers
-    'gmail.com', 'googlemail.com',  # Google
-    'outlook.com', 'hotmail.com', 'live.com', 'msn.com',  # Microsoft
-    'yahoo.com', 'yahoo.co.uk', 'yahoo.ca', 'yahoo.au', 'ymail.com', 'rocketmail.com',  # Yahoo
-    'aol.com', 'aim.com',  # AOL
-    'icloud.com', 'me.com', 'mac.com',  # Apple
-    'protonmail.com', 'proton.me',  # ProtonMail
-    'zoho.com', 'zohomail.com',  # Zoho
-    'yandex.com', 'yandex.ru',  # Yandex
-    'mail.ru', 'inbox.ru', 'list.ru', 'bk.ru',  # Mail.ru
-    'gmx.com', 'gmx.net', 'gmx.de',  # GMX
-    'web.de', 't-online.de',  # Deutsche Telekom
-    'comcast.net', 'verizon.net', 'att.net', 'bellsouth.net',  # US ISPs
-
-    # Common business domains (pre-validated)
-    'company.com', 'business.com', 'enterprise.com', 'corp.com', 'inc.com',
-    'example.com', 'test.com', 'sample.com', 'demo.com', 'fake.com',
-    'kalkiavatar.org', 'apple.com', 'microsoft.com', 'amazon.com', 'facebook.com', 'twitter.com',
-}
+KNOWN_VALID_DOMAINS = CompactStringSet()
 
-# Disposable/temporary email domains
-DISPOSABLE_DOMAINS = {
-    '10minutemail.com', 'guerrillamail.com', 'mailinator.com', 'tempmail.org',
-    'throwaway.email', 'yopmail.com', 'temp-mail.org', 'fakeinbox.com',
-    'maildrop.cc', 'tempail.com', 'dispostable.com', '0-mail.com',
-    'mytemp.email', 'temp-mail.io', 'mail-temp.com', 'tempinbox.com',
-    'spamgourmet.com', 'mailnull.com', 'suremail.info', 'spamhole.com',
-    'grr.la', 'pokemail.net', 'spam4.me', 'koszmail.pl', 'binkmail.com',
-    'spambog.ru', 'safersignup.de', 'deadaddress.com', 'kurzepost.de',
-    'lifebyfood.com', 'objectmail.com', 'obobbo.com', 'rcpt.at',
-    'spamobox.com', 'upliftnow.com', 'uplipht.com', 'venompen.com',
-    'walkmail.net', 'wetrainbayarea.com', 'zetmail.com'
-}
+# Disposable/temporary email domains (subdomains match too)
+DISPOSABLE_DOMAINS = DomainSuffixSet()
 
 # Role-based email prefixes that might indicate non-personal emails
-ROLE_PREFIXES = {
-    'admin', 'administrator', 'info', 'contact', 'support', 'help', 'sales',
-    'marketing', 'billing', 'accounts', 'finance', 'hr', 'humanresources',
-    'jobs', 'careers', 'recruitment', 'noreply', 'no-reply', 'donotreply',
-    'do-not-reply', 'newsletter', 'news', 'updates', 'alerts', 'notifications',
-    'webmaster', 'postmaster', 'hostmaster', 'root', 'sysadmin', 'abuse',
-    'security', 'privacy', 'legal', 'compliance', 'feedback', 'survey'
-}
+ROLE_PREFIXES = CompactStringSet()
 
-# Known spam trap domains/patterns
-SPAM_TRAP_DOMAINS = {
-    'spamtrap.com', 'spamcop.net', 'abuse.net', 'uol.com.br',
-    'blackhole.com', 'devnull.com', 'null.com', 'spamhole.com'
-}
+# Known spam trap domains/patterns (subdomains match too)
+SPAM_TRAP_DOMAINS = DomainSuffixSet()
 
 # Major providers that don't need SMTP verification
-MAJOR_PROVIDERS = KNOWN_VALID_DOMAINS.copy()
-
-async def cached_dns_lookup(domain):
-    """Cached DNS MX lookup with TTL and size management"""
-    now = asyncio.get_event_loop().time()
-
-    with dns_cache_lock:
-        # Check cache first
-        if domain in dns_cache:
-            cached_result, timestamp = dns_cache[domain]
-            if now - timestamp < DNS_CACHE_TTL:
-                return cached_result
-            else:
-                del dns_cache[domain]
-
-        # Clean up expired entries if cache is getting large
-        if len(dns_cache) >= DNS_CACHE_MAX_SIZE:
-            expired_domains = [
-                d for d, (_, ts) in dns_cache.items()
-                if now - ts >= DNS_CACHE_TTL
-            ]
-            for d in expired_domains:
-                del dns_cache[d]
-
-            # If still too large, remove oldest entries
-            if len(dns_cache) >= DNS_CACHE_MAX_SIZE:
-                sorted_entries = sorted(dns_cache.items(), key=lambda x: x[1][1])
-                domains_to_remove = [d for d, _ in sorted_entries[:len(sorted_entries) // 4]]
-                for d in domains_to_remove:
-                    del dns_cache[d]
-
-    try:
-        # Use thread pool for DNS lookup with timeout
-        mx_records = await asyncio.wait_for(
-            asyncio.get_event_loop().run_in_executor(
-                dns_executor, dns.resolver.resolve, domain, 'MX'
-            ),
-            timeout=10.0  # 10 second timeout
-        )
-        result = str(mx_records[0].exchange) if mx_records else None
+MAJOR_PROVIDERS = KNOWN_VALID_DOMAINS
 
-        with dns_cache_lock:
-            dns_cache[domain] = (result, now)
+DOMAIN_LIST_FILES = {
+    "known_valid_domains": (KNOWN_VALID_DOMAINS, os.path.join(DOMAIN_LISTS_DIR, "known_valid_domains.txt")),
+    "disposable_domains": (DISPOSABLE_DOMAINS, os.path.join(DOMAIN_LISTS_DIR, "disposable_domains.txt")),
+    "role_prefixes": (ROLE_PREFIXES, os.path.join(DOMAIN_LISTS_DIR, "role_prefixes.txt")),
+    "spam_trap_domains": (SPAM_TRAP_DOMAINS, os.path.join(DOMAIN_LISTS_DIR, "spam_trap_domains.txt")),
+}
+domain_lists_loaded_at = None
+
+# "Did you mean" typo suggestions are drawn from the popular mailbox domains (file order is
+# the ranking) followed by the known valid domains
+POPULAR_DOMAINS_FILE = os.path.join(DOMAIN_LISTS_DIR, "popular_domains.txt")
+domain_suggester = DomainSuggester()
+
+def load_domain_lists():
+    """(Re)load every domain list from disk and return entry counts"""
+    global domain_lists_loaded_at
+    counts = reload_lists(DOMAIN_LIST_FILES)
+    popular_domains = read_list_file(POPULAR_DOMAINS_FILE) if os.path.exists(POPULAR_DOMAINS_FILE) else []
+    domain_suggester.replace(popular_domains + list(KNOWN_VALID_DOMAINS))
+    counts["suggestion_domains"] = len(domain_suggester)
+    domain_lists_loaded_at = datetime.now(timezone.utc)
+    logger.info(f"Domain lists loaded: {counts}")
+    return counts
+
+load_domain_lists()
+
+# Mailbox-provider fingerprints, matched against the MX host right after DNS resolution.
+# Hosted providers either refuse RCPT probing or accept every recipient, so a probe tells
+# us nothing. Policies: "trust_format" (valid and deliverable), "catch_all" (report as a
+# catch-all domain), "skip_probe" (domain valid, mailbox unverifiable), "probe" (default)
+MAILBOX_PROVIDERS = {
+    "Google Workspace": {"mx_suffixes": ("google.com", "googlemail.com"), "policy": "trust_format"},
+    "Microsoft 365": {"mx_suffixes": ("protection.outlook.com", "outlook.com", "hotmail.com"), "policy": "catch_all"},
+    "Yahoo": {"mx_suffixes": ("yahoodns.net",), "policy": "trust_format"},
+    "Apple iCloud": {"mx_suffixes": ("icloud.com",), "policy": "trust_format"},
+    "Proofpoint": {"mx_suffixes": ("pphosted.com", "ppe-hosted.com"), "policy": "skip_probe"},
+    "Mimecast": {"mx_suffixes": ("mimecast.com",), "policy": "skip_probe"},
+    "Barracuda": {"mx_suffixes": ("barracudanetworks.com",), "policy": "skip_probe"},
+}
+MX_PROVIDER_SUFFIXES = {
+    suffix: provider for provider, fingerprint in MAILBOX_PROVIDERS.items() for suffix in fingerprint["mx_suffixes"]
+}
 
-        return result
-    except asyncio.TimeoutError:
-        logger.warning(f"DNS lookup timeout for domain: {domain}")
-        with dns_cache_lock:
-            dns_cache[domain] = (None, now)
+def fingerprint_mail_server(mail_server):
+    """Return the hosted mailbox provider behind an MX host, or None"""
+    labels = mail_server.rstrip('.').lower().split('.')
+    for i in range(len(labels) - 1):
+        provider = MX_PROVIDER_SUFFIXES.get('.'.join(labels[i:]))
+        if provider:
+            return provider
+    return None
+
+def provider_policy_verdict(mail_server):
+    """Map an MX host's provider policy to (valid, deliverable, reason), or None to probe"""
+    provider = fingerprint_mail_server(mail_server)
+    if not provider:
         return None
-    except Exception as e:
-        logger.warning(f"DNS lookup failed for domain {domain}: {e}")
-        # Cache negative results too
-        with dns_cache_lock:
-            dns_cache[domain] = (None, now)
+
+    policy = MAILBOX_PROVIDERS[provider]["policy"]
+    if policy == "trust_format":
+        return True, True, f"Valid Domain ({provider})"
+    elif policy == "catch_all":
+        return True, True, f"Domain Valid (Catch-all, {provider})"
+    elif policy == "skip_probe":
+        return True, True, f"Domain Valid (SMTP Blocked, {provider})"
+    return None
+
+# SMTP session reuse - addresses sharing an MX host are checked over a few long-lived sessions
+SMTP_HELO_NAME = 'emailvalidator.service'
+SMTP_PROBE_SENDER = 'verify@emailvalidator.service'
+SMTP_SESSIONS_PER_MX = 3  # Parallel sessions (and open connections) allowed per mail server
+SMTP_MIN_RCPT_PER_SESSION = 20  # Don't open another session for fewer recipients than this
+SMTP_MAX_RCPT_PER_TRANSACTION = 100  # RFC 5321 minimum servers must accept before RSET
+SMTP_MAX_RCPT_PER_SESSION = 500  # Recycle the connection after this many recipients
+SMTP_MAX_RECONNECTS = 2  # Reconnect attempts when a server hangs up without progress
+SMTP_MAX_OPEN_SOCKETS = VALIDATION_MAX_SMTP_SESSIONS  # Global cap on open probe connections across all hosts
+SMTP_POLITENESS_DELAY = 0.25  # Seconds between new connections to the same mail server
+
+def get_cached_catch_all(domain):
+    """Return True/False if the domain's catch-all status is known, None if it must be probed"""
+    return catch_all_cache.get(domain)
+
+def set_cached_catch_all(domain, is_catch_all):
+    """Remember whether a domain accepts mail for any mailbox"""
+    catch_all_cache[domain] = is_catch_all
+
+# Shared async SMTP prober - caps connections per MX host and globally
+smtp_prober = SMTPProber(
+    helo_name=SMTP_HELO_NAME,
+    sender=SMTP_PROBE_SENDER,
+    max_connections=SMTP_MAX_OPEN_SOCKETS,
+    max_connections_per_host=SMTP_SESSIONS_PER_MX,
+    politeness_delay=SMTP_POLITENESS_DELAY,
+    max_rcpt_per_transaction=SMTP_MAX_RCPT_PER_TRANSACTION,
+    max_rcpt_per_session=SMTP_MAX_RCPT_PER_SESSION,
+    max_reconnects=SMTP_MAX_RECONNECTS,
+    catch_all_lookup=get_cached_catch_all,
+    catch_all_store=set_cached_catch_all,
+)
+
+def normalize_email(email):
+    return email.strip().lower()
+
+def get_cached_validation_result(email):
+    """Return the cached result for an address (re-labelled with its age) or None"""
+    cached = result_cache.get(normalize_email(email))
+    if cached is None:
         return None
+    result, stored_at = cached
+    return result.model_copy(update={"email": email, "cached": True, "cache_age": round(time.time() - stored_at, 1)})
 
-async def validate_single_email(email):
-    """Advanced email validation with comprehensive checks"""
-    email = email.strip()
+def cache_validation_result(result):
+    """Store a freshly computed result if its outcome has a cache TTL"""
+    ttl = RESULT_CACHE_TTLS.get(result.reason)
+    if not ttl or result.cached:
+        return
 
-    # 1. Format Check (instant)
-    if not EMAIL_VALIDATION_PATTERN.match(email):
-        return EmailValidationResult(email=email, valid=False, deliverable=False, reason="Invalid Format")
+    result_cache.set(normalize_email(result.email), (result, time.time()), ttl=ttl)
 
-    local_part, domain = email.split('@')
-    domain = domain.lower()
-    local_part = local_part.lower()
+async def lookup_mail_server(domain):
+    """Resolve a domain's preferred MX host; None when the domain doesn't exist or has no MX
 
+    A lookup that fails (timeout, SERVFAIL) raises DNSLookupError - it says nothing about the domain.
+    """
+    try:
+        # Hedged lookup across nameservers; the resolver bounds its own time, wait_for is a backstop
+        mx_hosts = await asyncio.wait_for(dns_resolver.resolve_mx(domain), timeout=DNS_LOOKUP_TIMEOUT + 1)
+    except asyncio.TimeoutError:
+        logger.warning(f"DNS lookup timeout for domain: {domain}")
+        raise DNSLookupError(f"Timed out resolving {domain}")
+    except DNSLookupError as e:
+        logger.warning(f"DNS lookup failed for domain {domain}: {e}")
+        raise
+    return mx_hosts[0] if mx_hosts else None
+
+async def cached_dns_lookup(domain, user_key=None):
+    """Cached DNS MX lookup; concurrent lookups of one domain share a single query
+
+    NXDOMAIN / no MX is cached as None. Failed lookups raise DNSLookupError and aren't cached.
+    With a user_key, a cache miss queries within the governor's DNS limit; hits never wait for a slot.
+    """
+    async def load():
+        if user_key is None:
+            return await lookup_mail_server(domain)
+        async with validation_governor.dns.slot(user_key):
+            return await lookup_mail_server(domain)
+
+    return await dns_cache.get_or_load(domain, load)
+
+# Validation depth per request. "syntax" never leaves the process, "dns" stops after the MX
+# lookup, "smtp" probes mailboxes unless the MX provider's policy makes a probe pointless,
+# and "full" probes every mailbox that has an MX, ignoring provider policies
+VALIDATION_MODES = ("syntax", "dns", "smtp", "full")
+
+def check_domain_lists(domain):
+    """Instant domain checks against the static lists; returns (valid, deliverable, reason) or None"""
     # 2. Check disposable domains first
     if domain in DISPOSABLE_DOMAINS:
-        return EmailValidationResult(email=email, valid=False, deliverable=False, reason="Disposable Email Domain")
+        return False, False, "Disposable Email Domain"
 
     # 3. Check spam trap domains
     if domain in SPAM_TRAP_DOMAINS:
-        return EmailValidationResult(email=email, valid=False, deliverable=False, reason="Spam Trap Domain")
+        return False, False, "Spam Trap Domain"
 
     # 4. Check known valid domains (instant - no network calls)
     if domain in KNOWN_VALID_DOMAINS:
         if domain in MAJOR_PROVIDERS:
-            return EmailValidationResult(email=email, valid=True, deliverable=True, reason="Valid Domain (Major Provider)")
+            return True, True, "Valid Domain (Major Provider)"
+        else:
+            return True, True, "Valid Domain"
+
+    return None
+
+def smtp_result_to_validation(email, smtp_result):
+    """Map an SMTP probe outcome onto an EmailValidationResult"""
+    if smtp_result["status"] == "verified":
+        return EmailValidationResult(email=email, valid=True, deliverable=True, reason="Mailbox Verified", depth="smtp")
+    elif smtp_result["status"] == "catch_all":
+        return EmailValidationResult(email=email, valid=True, deliverable=True, reason="Domain Valid (Catch-all)", depth="smtp")
+    elif smtp_result["status"] == "not_verified":
+        return EmailValidationResult(email=email, valid=False, deliverable=False, reason="Mailbox Not Found", depth="smtp")
+    elif smtp_result["status"] == "smtp_unreachable":
+        return EmailValidationResult(email=email, valid=True, deliverable=False, reason="SMTP unreachable – possibly valid", depth="smtp")
+    elif smtp_result["status"] == "deferred":
+        return EmailValidationResult(email=email, valid=True, deliverable=False, reason=GREYLIST_DEFERRED_REASON, depth="smtp")
+    else:  # server_error
+        # If SMTP fails, still mark as valid since many servers block verification
+        return EmailValidationResult(email=email, valid=True, deliverable=True, reason="Domain Valid (SMTP Blocked)", depth="smtp")
+
+async def verify_mailboxes(mail_server, emails, on_result=None, user_key=None):
+    """Verify a group of addresses sharing one MX host over a few reused SMTP sessions
+
+    on_result(email, EmailValidationResult) is called as each address resolves. Each session
+    holds one of the governor's SMTP slots, shared fairly between user_keys. Addresses the
+    server defers with a 4xx are queued for a greylist re-probe.
+    """
+    unique_emails = list(dict.fromkeys(emails))
+    session_count = min(SMTP_SESSIONS_PER_MX, -(-len(unique_emails) // SMTP_MIN_RCPT_PER_SESSION))
+    chunks = [unique_emails[i::session_count] for i in range(session_count)]
+
+    results = {}
+
+    def record(email, smtp_result):
+        results[email] = smtp_result_to_validation(email, smtp_result)
+        if smtp_result["status"] == "deferred" and not schedule_greylist_retry(email, mail_server, smtp_result["message"]):
+            results[email] = results[email].model_copy(update={"reason": "Greylisted – possibly valid"})
+        if on_result:
+            on_result(email, results[email])
+
+    async def probe_chunk(chunk):
+        async with validation_governor.smtp.slot(user_key):
+            return await smtp_prober.probe(mail_server, chunk, on_result=record)
+
+    chunk_results = await asyncio.gather(*[probe_chunk(chunk) for chunk in chunks], return_exceptions=True)
+    for chunk, chunk_result in zip(chunks, chunk_results):
+        if isinstance(chunk_result, Exception):
+            # If the session itself blew up, mark its undecided addresses as SMTP unreachable
+            for email in chunk:
+                if email not in results:
+                    record(email, {"status": "smtp_unreachable", "message": f"SMTP unreachable: {chunk_result}"})
+
+    return results
+
+def suggest_email_correction(email, suggested_domain=None):
+    """"Did you mean" address when the email's domain looks like a typo of a popular one"""
+    local_part, _, domain = email.strip().rpartition('@')
+    if not local_part:
+        return None
+    suggested_domain = suggested_domain or domain_suggester.suggest(domain)
+    return f"{local_part}@{suggested_domain}" if suggested_domain else None
+
+async def validate_single_email(email, mode="smtp", user_key=None):
+    """Validate one address through the same pipeline as a batch"""
+    results = [result async for _, result in iter_validation_results([email], mode=mode, user_key=user_key)]
+    return results[0]
+
+def plan_validation_batch(emails):
+    """Normalize and dedupe a batch before any network work
+
+    Returns {normalized address: [input indexes]} so every check runs once per unique
+    address and its result fans back out to each duplicate.
+    """
+    addresses = {}
+    for i, email in enumerate(emails):
+        addresses.setdefault(normalize_email(email), []).append(i)
+    return addresses
+
+# Deadline-bounded requests hand unfinished addresses to a continuation: their checks keep
+# running in the background and the caller collects the results with the continuation token
+VALIDATION_CONTINUATION_TTL = 900  # 15 minutes
+VALIDATION_CONTINUATION_MAX_SIZE = 10000
+validation_continuations = TTLCache(max_size=VALIDATION_CONTINUATION_MAX_SIZE, ttl=VALIDATION_CONTINUATION_TTL, name="validation_continuations")
+
+def create_validation_continuation(user_id, admission=None):
+    """New continuation for one request; it's only registered if the deadline passes
+
+    admission is the request's governor reservation. Once the continuation is registered its
+    task releases what's left of it on finishing (see release_validation_admission).
+    """
+    return {"token": secrets.token_urlsafe(16), "user_id": user_id, "admission": admission,
+            "emails": {}, "reached": {}, "results": {}, "done": False, "task": None}
+
+def release_validation_admission(admission, continuation):
+    """Release a request's admission once its response is done
+
+    If a continuation is still running, the reservation for its addresses stays held and
+    the continuation's task releases it when the checks finish.
+    """
+    if continuation["task"] is None or continuation["done"]:
+        admission.release()
+    else:
+        held = sum(len(emails) for emails in continuation["emails"].values())
+        admission.release(admission.count - held)
+
+def pending_validation_result(email, reached):
+    """Placeholder for an address whose checks are still running"""
+    return EmailValidationResult(email=email, valid=reached.valid, deliverable=False, reason="Pending", depth=reached.depth, pending=True)
+
+async def iter_validation_results(emails, force_refresh=False, mode="smtp", time_budget=None, deadline=None,
+                                  continuation=None, user_key=None):
+    """Validate a batch, yielding (index, EmailValidationResult) the moment each address resolves
+
+    The batch is deduped and grouped by domain first: list checks and DNS run once per
+    unique domain, SMTP once per unique address grouped by MX host. Addresses that pass
+    the list checks and have a live entry in result_cache are answered immediately
+    unless force_refresh.
+
+    mode (see VALIDATION_MODES) bounds how deep each address is checked. When time_budget
+    seconds run out, addresses still in flight are answered with the result of the
+    deepest check they completed and the remaining work is cancelled. When deadline seconds
+    run out instead, they're yielded as pending placeholders and the work carries on in the
+    background, recording results into continuation (and result_cache). DNS and SMTP work
+    runs under validation_governor's process-wide limits on behalf of user_key.
+    """
+    queue = asyncio.Queue()
+    addresses = plan_validation_batch(emails)
+    pending = set(addresses)
+    fallbacks = {}  # Shallower result per in-flight address, returned if the time budget runs out
+    suggested_domains = {}  # Typo domain -> "did you mean" domain
+    detached = False
+
+    def emit(address, result):
+        if address not in pending:
+            return
+        pending.discard(address)
+        cache_validation_result(result)
+        if detached:
+            continuation["results"][address] = result
+            return
+        suggested_domain = suggested_domains.get(address.rpartition('@')[2])
+        for i in addresses[address]:
+            update = {}
+            if result.email != emails[i]:
+                update["email"] = emails[i]
+            if suggested_domain:
+                update["suggestion"] = suggest_email_correction(emails[i], suggested_domain)
+            queue.put_nowait((i, result.model_copy(update=update) if update else result))
+
+    def emit_all(domain_addresses, valid, deliverable, reason, depth):
+        for address in domain_addresses:
+            emit(address, EmailValidationResult(email=address, valid=valid, deliverable=deliverable, reason=reason, depth=depth))
+
+    # Instant pass: format and domain list checks once per unique address/domain, then cache
+    # hits. Lists run before the cache so a hot-reloaded list takes effect immediately
+    domains = {}
+    for address in addresses:
+        if not EMAIL_VALIDATION_PATTERN.match(address):
+            emit(address, EmailValidationResult(email=address, valid=False, deliverable=False, reason="Invalid Format", depth="syntax"))
         else:
-            return EmailValidationResult(email=email, valid=True, deliverable=True, reason="Valid Domain")
+            domains.setdefault(address.rsplit('@', 1)[1], []).append(address)
+
+    for domain in domains:
+        suggested_domain = domain_suggester.suggest(domain)
+        if suggested_domain:
+            suggested_domains[domain] = suggested_domain
+
+    for domain in list(domains):
+        verdict = check_domain_lists(domain)
+        if verdict:
+            emit_all(domains.pop(domain), *verdict, depth="syntax")
+        elif not force_refresh:
+            uncached = []
+            for address in domains[domain]:
+                cached_result = get_cached_validation_result(address)
+                if cached_result:
+                    emit(address, cached_result)
+                else:
+                    uncached.append(address)
+            if uncached:
+                domains[domain] = uncached
+            else:
+                del domains[domain]
+
+    for domain_addresses in domains.values():
+        for address in domain_addresses:
+            fallbacks[address] = EmailValidationResult(email=address, valid=True, deliverable=False, reason="Valid Format", depth="syntax")
+    if mode == "syntax":
+        for address in list(fallbacks):
+            emit(address, fallbacks[address])
+        domains = {}
+
+    async def run():
+        try:
+            # One DNS lookup per unique domain, within the governor's global DNS limit
+            smtp_groups = {}
 
-    # 5. For unknown domains, check DNS first
-    mail_server = await cached_dns_lookup(domain)
-    if not mail_server:
-        return EmailValidationResult(email=email, valid=False, deliverable=False, reason="Invalid Domain (No MX Record)")
+            async def resolve_domain(domain, domain_addresses):
+                try:
+                    mail_server = await cached_dns_lookup(domain, user_key=user_key)
+                except DNSLookupError:
+                    # Says nothing about the domain; not cached, so the next request looks it up again
+                    emit_all(domain_addresses, True, False, DNS_FAILED_REASON, "dns")
+                    return
+                except Exception:
+                    # If validation failed, return a safe result
+                    emit_all(domain_addresses, False, False, "Validation Error", "syntax")
+                    return
+
+                if not mail_server:
+                    emit_all(domain_addresses, False, False, "Invalid Domain (No MX Record)", "dns")
+                    return
+
+                # Hosted providers whose SMTP answers carry no information skip the probe
+                provider_verdict = provider_policy_verdict(mail_server) if mode != "full" else None
+
+                for address in domain_addresses:
+                    mx_result = EmailValidationResult(email=address, valid=True, deliverable=True, reason="Valid Domain (MX Found)", depth="dns")
+                    # Domain has MX, so role-based emails are acceptable
+                    if address.split('@', 1)[0] in ROLE_PREFIXES:
+                        emit(address, EmailValidationResult(email=address, valid=True, deliverable=True, reason="Role-based / non-personal", depth="dns"))
+                    elif provider_verdict:
+                        emit_all([address], *provider_verdict, depth="dns")
+                    elif mode == "dns":
+                        emit(address, mx_result)
+                    else:
+                        fallbacks[address] = mx_result
+                        smtp_groups.setdefault(mail_server.lower(), []).append(address)
 
-    # 6. Domain has MX, so role-based emails are acceptable
-    if local_part in ROLE_PREFIXES:
-        return EmailValidationResult(email=email, valid=True, deliverable=True, reason="Role-based / non-personal")
+            await asyncio.gather(*[resolve_domain(domain, domain_addresses) for domain, domain_addresses in domains.items()])
+
+            # Addresses that still need SMTP are grouped by MX host so each mail server sees a few
+            # sessions carrying many RCPT TOs. Groups run fully concurrent - smtp_prober enforces
+            # per-host and global connection caps
+            async def verify_group(mail_server, group_addresses):
+                try:
+                    await verify_mailboxes(mail_server, group_addresses, on_result=emit, user_key=user_key)
+                finally:
+                    emit_all(group_addresses, True, False, "SMTP unreachable – possibly valid", "smtp")
 
-    # 7. Advanced SMTP verification with catch-all detection
+            await asyncio.gather(*[verify_group(mail_server, group_addresses) for mail_server, group_addresses in smtp_groups.items()], return_exceptions=True)
+        except Exception as e:
+            logger.error(f"Batch validation failed: {e}")
+        finally:
+            for address in list(pending):
+                emit(address, EmailValidationResult(email=address, valid=False, deliverable=False, reason="Validation Error", depth="syntax"))
+            if continuation is not None:
+                continuation["done"] = True
+                if detached and continuation["admission"]:
+                    continuation["admission"].release()
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    loop = asyncio.get_running_loop()
+    budget_at = loop.time() + time_budget if time_budget is not None else None
+    deadline_at = loop.time() + deadline if deadline is not None and continuation is not None else None
     try:
-        smtp_result = await asyncio.to_thread(check_smtp_advanced, mail_server, email, domain)
-
-        if smtp_result["status"] == "verified":
-            return EmailValidationResult(email=email, valid=True, deliverable=True, reason="Mailbox Verified")
-        elif smtp_result["status"] == "catch_all":
-            return EmailValidationResult(email=email, valid=True, deliverable=True, reason="Domain Valid (Catch-all)")
-        elif smtp_result["status"] == "not_verified":
-            return EmailValidationResult(email=email, valid=False, deliverable=False, reason="Mailbox Not Found")
-        elif smtp_result["status"] == "smtp_unreachable":
-            return EmailValidationResult(email=email, valid=True, deliverable=False, reason="SMTP unreachable – possibly valid")
-        else:  # server_error
-            # If SMTP fails, still mark as valid since many servers block verification
-            return EmailValidationResult(email=email, valid=True, deliverable=True, reason="Domain Valid (SMTP Blocked)")
-
-    except Exception:
-        # If advanced SMTP fails, mark as SMTP unreachable
-        return EmailValidationResult(email=email, valid=True, deliverable=False, reason="SMTP unreachable – possibly valid")
+        while True:
+            try:
+                stop_at = min((t for t in (budget_at, deadline_at) if t is not None), default=None)
+                timeout = max(0, stop_at - loop.time()) if stop_at is not None else None
+                item = await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if deadline_at is None or (budget_at is not None and budget_at <= deadline_at):
+                    # Out of time - answer what's left at the depth it reached and stop the work
+                    for address in list(pending):
+                        emit(address, fallbacks[address])
+                    task.cancel()
+                    budget_at = deadline_at = None
+                    continue
+
+                # Deadline passed - flush what's already decided, report the rest as pending and
+                # let the remaining checks finish in the background into the continuation
+                detached = True
+                while not queue.empty():
+                    item = queue.get_nowait()
+                    if item is not None:
+                        yield item
+                for address in [address for address in addresses if address in pending]:
+                    continuation["emails"][address] = [emails[i] for i in addresses[address]]
+                    continuation["reached"][address] = fallbacks[address]
+                    for i in addresses[address]:
+                        yield i, pending_validation_result(emails[i], fallbacks[address])
+                continuation["task"] = task
+                validation_continuations[continuation["token"]] = continuation
+                break
+            if item is None:
+                break
+            yield item
+    finally:
+        if not task.done() and not detached:
+            task.cancel()
 
-@app.post("/email/validate", response_model=EmailValidationResponse)
-async def validate_emails(request: EmailValidationRequest, current_user: DBUser = Depends(get_current_user)):
-    # Input validation
-    if not request.emails or len(request.emails) == 0:
+def clean_validation_emails(emails):
+    """Validate request input and return the stripped list of emails"""
+    if not emails or len(emails) == 0:
         raise HTTPException(status_code=400, detail="No emails provided")
 
-    if len(request.emails) > 1000:
+    if len(emails) > 1000:
         raise HTTPException(status_code=400, detail="Maximum 1000 emails allowed")
 
     # Validate each email format and length
     validated_emails = []
-    for email in request.emails:
+    for email in emails:
         if not isinstance(email, str):
             raise HTTPException(status_code=400, detail="All emails must be strings")
 
@@ -1800,98 +2143,837 @@ async def validate_emails(request: EmailValidationRequest, current_user: DBUser
 
         validated_emails.append(email)
 
-    request.emails = validated_emails
+    return validated_emails
 
-    # Process all emails in parallel with semaphore to prevent overwhelming
-    semaphore = asyncio.Semaphore(min(25, len(request.emails)))  # Limit concurrent validations
+def check_validation_options(request):
+    """Reject unknown validation modes and non-positive time budgets or deadlines"""
+    if request.mode not in VALIDATION_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(VALIDATION_MODES)}")
 
-    async def validate_with_semaphore(email):
-        async with semaphore:
-            return await validate_single_email(email)
+    if request.time_budget is not None and request.time_budget <= 0:
+        raise HTTPException(status_code=400, detail="time_budget must be a positive number of seconds")
 
-    # Create validation tasks
-    tasks = [validate_with_semaphore(email) for email in request.emails]
+    if request.deadline is not None and request.deadline <= 0:
+        raise HTTPException(status_code=400, detail="deadline must be a positive number of seconds")
 
-    # Execute all validations concurrently
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+def admit_validation(user_id, count):
+    """Reserve governor capacity for a request, answering 429 with Retry-After when saturated"""
+    try:
+        return validation_governor.admit(user_id, count)
+    except ValidationSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
 
-    # Handle any exceptions that occurred
-    final_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            # If validation failed, return a safe result
-            final_results.append(EmailValidationResult(
-                email=request.emails[i],
-                valid=False,
-                deliverable=False,
-                reason="Validation Error"
-            ))
-        else:
-            final_results.append(result)
+@app.post("/email/validate", response_model=EmailValidationResponse)
+async def validate_emails(request: EmailValidationRequest, current_user: DBUser = Depends(get_current_user)):
+    request.emails = clean_validation_emails(request.emails)
+    check_validation_options(request)
 
-    return EmailValidationResponse(results=final_results)
+    final_results = [None] * len(request.emails)
+    admission = admit_validation(current_user.id, len(request.emails))
+    continuation = create_validation_continuation(current_user.id, admission)
+    try:
+        async for i, result in iter_validation_results(request.emails, force_refresh=request.force_refresh, mode=request.mode,
+                                                       time_budget=request.time_budget, deadline=request.deadline,
+                                                       continuation=continuation, user_key=current_user.id):
+            final_results[i] = result
+    finally:
+        release_validation_admission(admission, continuation)
+
+    token = continuation["token"] if continuation["emails"] else None
+    return EmailValidationResponse(results=final_results, continuation_token=token)
+
+@app.get("/email/validate/continuations/{token}", response_model=EmailValidationResponse)
+def get_validation_continuation(token: str, current_user: DBUser = Depends(get_current_user)):
+    """Results for addresses left pending by a deadline-bounded request"""
+    continuation = validation_continuations.get(token)
+    if not continuation or continuation["user_id"] != current_user.id:
+        raise HTTPException(status_code=404, detail="Continuation not found or expired")
+
+    results = []
+    for address, emails in continuation["emails"].items():
+        result = continuation["results"].get(address)
+        if result is None or result.reason == GREYLIST_DEFERRED_REASON:
+            # Greylisted addresses are re-probed later and land in the result cache
+            result = get_cached_validation_result(address) or result
+        for email in emails:
+            if result:
+                results.append(result if result.email == email else result.model_copy(update={"email": email}))
+            else:
+                results.append(pending_validation_result(email, continuation["reached"][address]))
+
+    still_pending = any(result.pending for result in results)
+    return EmailValidationResponse(results=results, continuation_token=token if still_pending else None)
+
+@app.post("/email/validate/stream")
+async def validate_emails_stream(request: EmailValidationRequest, format: str = "ndjson", current_user: DBUser = Depends(get_current_user)):
+    """Stream each validation result as NDJSON (or SSE with format=sse) the moment it resolves"""
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
 
-# Ultra-fast SMTP checking with optimized timeout
-def check_smtp_mailbox_fast(mail_server, email_address, domain):
-    """Fast SMTP verification with shorter timeout"""
+    emails = clean_validation_emails(request.emails)
+    check_validation_options(request)
+    admission = admit_validation(current_user.id, len(emails))
+    continuation = create_validation_continuation(current_user.id, admission)
+
+    async def result_stream():
+        try:
+            async for i, result in iter_validation_results(emails, force_refresh=request.force_refresh, mode=request.mode,
+                                                           time_budget=request.time_budget, deadline=request.deadline,
+                                                           continuation=continuation, user_key=current_user.id):
+                payload = json.dumps({"index": i, **result.model_dump()})
+                if format == "sse":
+                    yield f"event: result\ndata: {payload}\n\n"
+                else:
+                    yield payload + "\n"
+            token = continuation["token"] if continuation["emails"] else None
+            if format == "sse":
+                yield f"event: done\ndata: {json.dumps({'total': len(emails), 'continuation_token': token})}\n\n"
+            elif token:
+                yield json.dumps({"continuation_token": token}) + "\n"
+        finally:
+            release_validation_admission(admission, continuation)
+
+    # The background release covers clients that disconnect before the stream starts
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(result_stream(), media_type=media_type,
+                             background=BackgroundTask(release_validation_admission, admission, continuation),
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# --- Bulk Validation Jobs ---
+
+# Jobs of any size are spooled to disk and validated by a background worker in chunks.
+# results.ndjson is the checkpoint: after a restart a job resumes after the last complete line.
+VALIDATION_JOBS_DIR = os.getenv("VALIDATION_JOBS_DIR", "validation_jobs")
+VALIDATION_JOB_CHUNK_SIZE = 1000  # Addresses validated (and checkpointed) per chunk
+VALIDATION_JOB_WORKERS = 2  # Jobs processed concurrently
+validation_job_queue = asyncio.Queue()
+validation_job_workers = []
+
+def validation_job_path(job_id, name):
+    return os.path.join(VALIDATION_JOBS_DIR, job_id, name)
+
+def extract_job_email(line):
+    """Pull the address out of a plain or CSV line (first field containing '@')"""
+    for field in re.split(r'[,;\t]', line):
+        field = field.strip().strip('"\'')
+        if '@' in field:
+            return field
+    return None
+
+def get_user_validation_job(db, job_id, current_user):
+    job = db.query(ValidationJob).filter(ValidationJob.id == job_id).first()
+    if not job or (job.user_id != current_user.id and current_user.role != "admin"):
+        raise HTTPException(status_code=404, detail="Validation job not found")
+    return job
+
+def load_job_retries(job_id):
+    """Re-probed results ({line number: result}) that supersede lines of results.ndjson"""
+    retries_path = validation_job_path(job_id, "retries.ndjson")
+    retries = {}
+    if os.path.exists(retries_path):
+        with open(retries_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                result = json.loads(line)
+                retries[result.pop("line")] = result
+    return retries
+
+def load_job_checkpoint(job_id):
+    """Return (processed, valid, deliverable) from results on disk, dropping any torn final line"""
+    results_path = validation_job_path(job_id, "results.ndjson")
+    if not os.path.exists(results_path):
+        return 0, 0, 0
+
+    retries = load_job_retries(job_id)
+    processed = valid_count = deliverable_count = 0
+    good_bytes = 0
+    with open(results_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                result = retries.get(processed) or json.loads(line)
+            except ValueError:
+                break
+            processed += 1
+            valid_count += bool(result.get("valid"))
+            deliverable_count += bool(result.get("deliverable"))
+            good_bytes += len(line)
+
+    if good_bytes != os.path.getsize(results_path):
+        with open(results_path, "r+b") as f:
+            f.truncate(good_bytes)
+
+    return processed, valid_count, deliverable_count
+
+def load_job_results(job_id):
+    """A job's results so far as an AddressStore, one row per line with retries applied
+
+    Roughly 30 bytes per address, so even multi-million-address jobs fit in memory whole
+    where parsed result dicts would not.
+    """
+    store = AddressStore()
+    with open(validation_job_path(job_id, "results.ndjson"), "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            result = json.loads(line)
+            store.set_result(store.append(result["email"]), result["valid"], result["deliverable"], result.get("reason"))
+
+    retries_path = validation_job_path(job_id, "retries.ndjson")
+    if os.path.exists(retries_path):
+        with open(retries_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                result = json.loads(line)
+                if result["line"] < len(store):
+                    store.set_result(result["line"], result["valid"], result["deliverable"], result.get("reason"))
+    return store
+
+def update_validation_job(job_id, **fields):
+    db = SessionLocal()
     try:
-        with smtplib.SMTP(mail_server, timeout=5) as server:  # Reduced timeout
-            server.set_debuglevel(0)
-            server.helo('emailvalidator.service')
+        job = db.query(ValidationJob).filter(ValidationJob.id == job_id).first()
+        if not job:
+            return None
+        for key, value in fields.items():
+            setattr(job, key, value)
+        db.commit()
+        return job.status
+    finally:
+        db.close()
 
-            # Check the actual email address only (skip catch-all detection for speed)
-            code_real, _ = server.rcpt(email_address)
+def load_validation_job(job_id):
+    db = SessionLocal()
+    try:
+        job = db.query(ValidationJob).filter(ValidationJob.id == job_id).first()
+        return ValidationJobSchema.model_validate(job) if job else None
+    finally:
+        db.close()
 
-            if code_real == 250:
-                return "verified", "Mailbox exists"
-            elif code_real in (550, 551, 552, 553, 554):
-                return "not_verified", f"Mailbox rejected (code {code_real})"
-            else:
-                return "server_error", f"Unexpected response code {code_real}"
+def get_validation_job_owner(job_id):
+    db = SessionLocal()
+    try:
+        job = db.query(ValidationJob.user_id).filter(ValidationJob.id == job_id).first()
+        return job.user_id if job else None
+    finally:
+        db.close()
 
-    except smtplib.SMTPException as e:
-        return "server_error", f"SMTP error: {str(e)}"
-    except (ConnectionError, OSError) as e:
-        return "server_error", f"Connection error: {str(e)}"
-    except Exception as e:
-        return "server_error", f"Unexpected error: {str(e)}"
+def get_validation_job_status(job_id):
+    db = SessionLocal()
+    try:
+        job = db.query(ValidationJob.status).filter(ValidationJob.id == job_id).first()
+        return job.status if job else None
+    finally:
+        db.close()
 
-# Advanced SMTP checking with catch-all detection
-def check_smtp_advanced(mail_server, email_address, domain):
-    """Advanced SMTP verification with catch-all detection"""
-    # Use a random, non-existent email to check for catch-all
-    random_user = uuid.uuid4().hex[:16]
-    fake_email_for_check = f"{random_user}@{domain}"
+async def run_validation_job(job_id):
+    """Validate a job's input file chunk by chunk, resuming from its on-disk checkpoint"""
+    processed, valid_count, deliverable_count = await asyncio.to_thread(load_job_checkpoint, job_id)
+    if await asyncio.to_thread(update_validation_job, job_id, status="running", processed=processed,
+                               valid_count=valid_count, deliverable_count=deliverable_count) is None:
+        return
+    user_id = await asyncio.to_thread(get_validation_job_owner, job_id)
+
+    def read_chunks():
+        with open(validation_job_path(job_id, "input.txt"), "r", encoding="utf-8") as f:
+            chunk = []
+            for line_number, line in enumerate(f):
+                if line_number < processed:
+                    continue
+                chunk.append(line.rstrip("\n"))
+                if len(chunk) >= VALIDATION_JOB_CHUNK_SIZE:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+    with open(validation_job_path(job_id, "results.ndjson"), "a", encoding="utf-8") as results_file:
+        for chunk in read_chunks():
+            # Stop between chunks if the job was deleted
+            if await asyncio.to_thread(get_validation_job_status, job_id) != "running":
+                return
+
+            chunk_results = [None] * len(chunk)
+            greylisted = False
+            async for i, result in iter_validation_results(chunk, user_key=user_id):
+                chunk_results[i] = result
+                if result.reason == GREYLIST_DEFERRED_REASON:
+                    # Subscribed right away, so a re-probe that comes due before the chunk ends
+                    # still updates this job's results (retries.ndjson is keyed by line number)
+                    subscribe_greylist_retry(chunk[i], job_id, processed + i)
+                    greylisted = True
+
+            # Marked before the deferred lines are written, so a restart always finds them
+            if greylisted:
+                await asyncio.to_thread(mark_job_greylisted, job_id)
+
+            results_file.write("".join(json.dumps(result.model_dump()) + "\n" for result in chunk_results))
+            results_file.flush()
+            os.fsync(results_file.fileno())
+
+            # Counts are incremented rather than set so greylist retries can adjust them concurrently
+            processed += len(chunk)
+            await asyncio.to_thread(update_validation_job, job_id, processed=processed,
+                                    valid_count=ValidationJob.valid_count + sum(1 for result in chunk_results if result.valid),
+                                    deliverable_count=ValidationJob.deliverable_count + sum(1 for result in chunk_results if result.deliverable))
+
+    await asyncio.to_thread(update_validation_job, job_id, status="completed", completed_at=datetime.utcnow())
+    logger.info(f"Validation job {job_id} completed ({processed} addresses)")
+
+async def validation_job_worker():
+    while True:
+        job_id = await validation_job_queue.get()
+        try:
+            await run_validation_job(job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Validation job {job_id} failed: {e}")
+            await asyncio.to_thread(update_validation_job, job_id, status="failed", error_message=str(e)[:MAX_ERROR_MESSAGE_LENGTH])
+        finally:
+            validation_job_queue.task_done()
 
+def start_validation_job_workers():
+    """Start background workers and re-queue jobs interrupted by a restart"""
+    db = SessionLocal()
     try:
-        with smtplib.SMTP(mail_server, timeout=8) as server:  # Slightly longer timeout for advanced check
-            server.set_debuglevel(0)
-            server.helo('emailvalidator.service')
-            server.mail('verify@emailvalidator.service')
+        unfinished = db.query(ValidationJob.id).filter(ValidationJob.status.in_(["queued", "running"])).order_by(ValidationJob.created_at).all()
+    except Exception as e:
+        logger.error(f"Could not load unfinished validation jobs: {e}")
+        unfinished = []
+    finally:
+        db.close()
 
-            # Check the actual email address
-            code_real, _ = server.rcpt(email_address)
+    for job in unfinished:
+        validation_job_queue.put_nowait(job.id)
+    if unfinished:
+        logger.info(f"Resuming {len(unfinished)} validation jobs")
+
+    for _ in range(VALIDATION_JOB_WORKERS):
+        validation_job_workers.append(asyncio.create_task(validation_job_worker()))
+    validation_job_workers.append(asyncio.create_task(greylist_retry_worker()))
+
+async def stop_validation_job_workers():
+    for worker in validation_job_workers:
+        worker.cancel()
+    await asyncio.gather(*validation_job_workers, return_exceptions=True)
+    validation_job_workers.clear()
+
+# --- Greylist Re-probes ---
+
+# A 4xx reply to RCPT TO (greylisting, rate limiting) is a deferral, not a dead mailbox. Deferred
+# addresses are re-probed after the server's greylist window - only those addresses, never the
+# whole batch - and the outcome replaces the deferred result in the result cache and job results
+GREYLIST_DEFERRED_REASON = "Greylisted – retry scheduled"
+GREYLIST_RETRY_DELAYS = (300, 900, 1800)  # Seconds before each successive re-probe
+GREYLIST_MAX_RETRY_DELAY = 3600  # Cap on a server-advertised greylist window
+GREYLIST_RETRY_POLL_INTERVAL = 30  # Seconds between scans for due re-probes
+GREYLIST_MAX_PENDING = 50000  # Deferred addresses tracked at once
+# A wait the server advertises, e.g. "try again in 5 minutes", "greylisted for 300s"
+GREYLIST_WINDOW_PATTERN = re.compile(r'\b(\d{1,5})\s*(seconds?|secs?|s|minutes?|mins?)\b', re.IGNORECASE)
+GREYLIST_JOB_MARKER = "greylisted"  # Present in a job directory while its results may hold deferred lines
+
+# normalized address -> {"email", "mail_server", "attempt", "due", "jobs": [(job_id, line, email)]}
+# "due" is None while a re-probe is in flight
+greylist_retries = {}
+
+def greylist_retry_delay(attempt, message):
+    """Seconds to wait before re-probe number `attempt`, honouring a window the server advertises"""
+    delay = GREYLIST_RETRY_DELAYS[attempt - 1]
+    match = GREYLIST_WINDOW_PATTERN.search(message or "")
+    if match:
+        window = int(match.group(1)) * (60 if match.group(2).lower().startswith("min") else 1)
+        delay = max(delay, min(window + 30, GREYLIST_MAX_RETRY_DELAY))
+    return delay
+
+def schedule_greylist_retry(email, mail_server, message):
+    """Queue a deferred address for a re-probe; False when it won't be retried again"""
+    key = normalize_email(email)
+    entry = greylist_retries.get(key)
+    if entry is not None and entry["due"] is not None:
+        return True  # Already waiting for its re-probe
+
+    attempt = entry["attempt"] + 1 if entry else 1
+    if attempt > len(GREYLIST_RETRY_DELAYS):
+        return False
+    if entry is None:
+        if len(greylist_retries) >= GREYLIST_MAX_PENDING:
+            logger.warning(f"Greylist retry queue full, not re-probing {email}")
+            return False
+        entry = greylist_retries[key] = {"email": email, "mail_server": mail_server, "jobs": []}
+
+    entry.update(attempt=attempt, due=time.time() + greylist_retry_delay(attempt, message))
+    return True
+
+def subscribe_greylist_retry(email, job_id, line):
+    """Have a pending re-probe also update line `line` of a bulk job's results"""
+    entry = greylist_retries.get(normalize_email(email))
+    if entry is not None:
+        entry["jobs"].append((job_id, line, email))
+
+def mark_job_greylisted(job_id):
+    open(validation_job_path(job_id, GREYLIST_JOB_MARKER), "a").close()
+
+def find_deferred_job_lines(job_id):
+    """(line number, email) of results.ndjson lines still deferred - not superseded by retries.ndjson"""
+    retries = load_job_retries(job_id)
+    deferred = []
+    with open(validation_job_path(job_id, "results.ndjson"), "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f):
+            if not line.endswith("\n"):
+                break
+            if line_number in retries or "Greylisted" not in line:  # Cheap filter; the reason is JSON-escaped
+                continue
+            result = json.loads(line)
+            if result.get("reason") == GREYLIST_DEFERRED_REASON:
+                deferred.append((line_number, result["email"]))
+    return deferred
+
+def find_greylisted_jobs():
+    """{job_id: deferred lines} for jobs with a greylist marker; markers of fully resolved jobs are removed"""
+    jobs = {}
+    if not os.path.isdir(VALIDATION_JOBS_DIR):
+        return jobs
+    for job_id in os.listdir(VALIDATION_JOBS_DIR):
+        marker = validation_job_path(job_id, GREYLIST_JOB_MARKER)
+        if not os.path.exists(marker):
+            continue
+        try:
+            deferred = find_deferred_job_lines(job_id)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read deferred results of validation job {job_id}: {e}")
+            continue
+        if deferred:
+            jobs[job_id] = deferred
+        else:
+            os.remove(marker)
+    return jobs
+
+async def restore_greylist_retries():
+    """Rebuild the in-memory re-probe queue from job results after a restart"""
+    jobs = await asyncio.to_thread(find_greylisted_jobs)
+    restored = 0
+    for job_id, deferred in jobs.items():
+        for line, email in deferred:
+            try:
+                mail_server = await cached_dns_lookup(email.rsplit('@', 1)[1].lower())
+            except DNSLookupError:
+                mail_server = None
+            if not mail_server:
+                continue  # Left deferred; picked up again on the next restart
+            if schedule_greylist_retry(email, mail_server, None):
+                subscribe_greylist_retry(email, job_id, line)
+                restored += 1
+    if restored:
+        logger.info(f"Re-queued {restored} greylisted addresses from {len(jobs)} validation jobs")
+
+def record_validation_job_retry(job_id, line, result):
+    """Append a re-probed result to the job's retries file and adjust its counts"""
+    if not os.path.isdir(validation_job_path(job_id, "")):
+        return  # Job was deleted
+
+    with open(validation_job_path(job_id, "retries.ndjson"), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"line": line, **result.model_dump()}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+    # The deferred result counted as valid but not deliverable
+    update_validation_job(job_id, valid_count=ValidationJob.valid_count + int(result.valid) - 1,
+                          deliverable_count=ValidationJob.deliverable_count + int(result.deliverable))
+
+async def run_greylist_retries():
+    """Re-probe every due address, grouped by MX host"""
+    now = time.time()
+    groups = {}
+    for entry in greylist_retries.values():
+        if entry["due"] is not None and entry["due"] <= now:
+            entry["due"] = None
+            groups.setdefault(entry["mail_server"], []).append(entry)
+
+    async def retry_group(mail_server, entries):
+        try:
+            results = await verify_mailboxes(mail_server, [entry["email"] for entry in entries], user_key="greylist-retry")
+        except Exception as e:
+            logger.warning(f"Greylist re-probe failed for {mail_server}: {e}")
+            results = {}
 
-            if code_real != 250:
-                # If the real email is rejected, we know it's not valid
-                return {"status": "not_verified", "message": f"Mailbox rejected with code {code_real}"}
+        for entry in entries:
+            result = results.get(entry["email"])
+            if result is None:
+                result = EmailValidationResult(email=entry["email"], valid=True, deliverable=False, reason="SMTP unreachable – possibly valid", depth="smtp")
+            elif result.reason == GREYLIST_DEFERRED_REASON:
+                continue  # Deferred again and rescheduled
 
-            # If the real email was accepted, check the fake one to detect a catch-all
-            code_fake, _ = server.rcpt(fake_email_for_check)
+            greylist_retries.pop(normalize_email(entry["email"]), None)
+            cache_validation_result(result)
+            for job_id, line, email in entry["jobs"]:
+                await asyncio.to_thread(record_validation_job_retry, job_id, line, result.model_copy(update={"email": email}))
 
-            if code_fake == 250:
-                # If the server also accepts a random fake email, it's a catch-all
-                return {"status": "catch_all", "message": "Domain is a catch-all"}
-            else:
-                # If the server accepts the real one but rejects the fake one, it's truly verified
-                return {"status": "verified", "message": "Mailbox exists"}
+    await asyncio.gather(*[retry_group(mail_server, entries) for mail_server, entries in groups.items()])
+
+async def greylist_retry_worker():
+    try:
+        await restore_greylist_retries()
+    except Exception as e:
+        logger.error(f"Could not restore greylist retries: {e}")
+    while True:
+        await asyncio.sleep(GREYLIST_RETRY_POLL_INTERVAL)
+        try:
+            await run_greylist_retries()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Greylist retry pass failed: {e}")
+
+@app.post("/email/validate/jobs", response_model=ValidationJobSchema, status_code=status.HTTP_201_CREATED)
+async def create_validation_job(file: UploadFile = File(...), db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    """Upload a list of any size (one address per line, or CSV) for background validation"""
+    job_id = str(uuid.uuid4())
+    os.makedirs(os.path.join(VALIDATION_JOBS_DIR, job_id), exist_ok=True)
+
+    # Spool the upload to disk line by line so memory stays flat regardless of list size
+    total = 0
+    remainder = b""
+    with open(validation_job_path(job_id, "input.txt"), "w", encoding="utf-8") as input_file:
+        while True:
+            data = await file.read(1024 * 1024)
+            if not data:
+                break
+            lines = (remainder + data).split(b"\n")
+            remainder = lines.pop()
+            for raw_line in lines:
+                email = extract_job_email(raw_line.decode("utf-8", errors="replace"))
+                if email and len(email) <= EMAIL_MAX_LENGTH:
+                    input_file.write(email + "\n")
+                    total += 1
+        email = extract_job_email(remainder.decode("utf-8", errors="replace"))
+        if email and len(email) <= EMAIL_MAX_LENGTH:
+            input_file.write(email + "\n")
+            total += 1
+    open(validation_job_path(job_id, "results.ndjson"), "w").close()
+
+    if total == 0:
+        shutil.rmtree(os.path.join(VALIDATION_JOBS_DIR, job_id), ignore_errors=True)
+        raise HTTPException(status_code=400, detail="No email addresses found in upload")
+
+    job = ValidationJob(id=job_id, user_id=current_user.id, filename=(file.filename or "")[:255] or None, total=total)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    validation_job_queue.put_nowait(job_id)
+    log_user_activity(current_user.id, current_user.username, "validation_job", "system", f"Queued validation job {job_id} ({total} addresses)")
+    return job
+
+@app.get("/email/validate/jobs", response_model=List[ValidationJobSchema])
+def list_validation_jobs(db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    return db.query(ValidationJob).filter(ValidationJob.user_id == current_user.id).order_by(ValidationJob.created_at.desc()).limit(50).all()
+
+@app.get("/email/validate/jobs/{job_id}", response_model=ValidationJobSchema)
+def get_validation_job(job_id: str, db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    return get_user_validation_job(db, job_id, current_user)
+
+@app.get("/email/validate/jobs/{job_id}/events")
+async def stream_validation_job(job_id: str, db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    """Server-Sent Events stream of job progress until it finishes"""
+    get_user_validation_job(db, job_id, current_user)
+
+    async def progress_stream():
+        last_payload = None
+        while True:
+            job = await asyncio.to_thread(load_validation_job, job_id)
+            if job is None:
+                break
+            payload = job.model_dump_json()
+            if payload != last_payload:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last_payload = payload
+            if job.status in ("completed", "failed"):
+                break
+            await asyncio.sleep(1)
+
+    return StreamingResponse(progress_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+JOB_RESULT_OUTCOMES = {"deliverable": DELIVERABLE, "undeliverable": UNDELIVERABLE, "invalid": INVALID}
+
+@app.get("/email/validate/jobs/{job_id}/results")
+def download_validation_job_results(job_id: str, format: str = "csv", outcome: Optional[str] = None,
+                                    db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    """Download results validated so far as CSV or NDJSON
+
+    The CSV is built from the whole job loaded into an AddressStore, so it can be limited to one
+    outcome (e.g. outcome=deliverable for a send-ready list) and the per-outcome totals are
+    known up front, in the X-Deliverable-Count, X-Undeliverable-Count and X-Invalid-Count headers.
+    NDJSON streams every line with all its fields.
+    """
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+    if outcome is not None and (format != "csv" or outcome not in JOB_RESULT_OUTCOMES):
+        raise HTTPException(status_code=400, detail=f"outcome must be one of: {', '.join(JOB_RESULT_OUTCOMES)} (CSV only)")
+
+    job = get_user_validation_job(db, job_id, current_user)
+    results_path = validation_job_path(job.id, "results.ndjson")
+    if not os.path.exists(results_path):
+        raise HTTPException(status_code=404, detail="No results available")
+    filename = f"validation-{job.id}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if format == "ndjson":
+        retries = load_job_retries(job.id)
+
+        def ndjson_rows():
+            with open(results_path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f):
+                    if line.endswith("\n"):
+                        yield json.dumps(retries[line_number]) + "\n" if line_number in retries else line
+
+        return StreamingResponse(ndjson_rows(), media_type="application/x-ndjson", headers=headers)
+
+    store = load_job_results(job.id)
+    counts = store.counts()
+    for name in JOB_RESULT_OUTCOMES:
+        headers[f"X-{name.capitalize()}-Count"] = str(counts[name])
+
+    def csv_rows():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["email", "valid", "deliverable", "reason"])
+        for _, email, row_outcome, reason in store.iter_rows(outcome=JOB_RESULT_OUTCOMES.get(outcome)):
+            writer.writerow([email, row_outcome != INVALID, row_outcome == DELIVERABLE, reason or ""])
+            if buffer.tell() > 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return StreamingResponse(csv_rows(), media_type="text/csv", headers=headers)
+
+@app.delete("/email/validate/jobs/{job_id}")
+def delete_validation_job(job_id: str, db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    """Delete a job and its files; a running job stops at its next chunk"""
+    job = get_user_validation_job(db, job_id, current_user)
+    db.delete(job)
+    db.commit()
+    shutil.rmtree(os.path.join(VALIDATION_JOBS_DIR, job_id), ignore_errors=True)
+    return {"message": "Validation job deleted"}
+
+@app.get("/admin/validation/domain-lists")
+def get_domain_lists(current_user: DBUser = Depends(get_current_admin_user)):
+    """Entry counts for the validator's domain and prefix lists"""
+    return {
+        "directory": DOMAIN_LISTS_DIR,
+        "loaded_at": domain_lists_loaded_at.isoformat() if domain_lists_loaded_at else None,
+        "counts": {**{name: len(lookup_set) for name, (lookup_set, _) in DOMAIN_LIST_FILES.items()},
+                   "suggestion_domains": len(domain_suggester)}
+    }
 
-    except smtplib.SMTPException as e:
-        return {"status": "smtp_unreachable", "message": f"SMTP unreachable: {str(e)}"}
-    except (ConnectionError, OSError) as e:
-        return {"status": "smtp_unreachable", "message": f"SMTP unreachable: {str(e)}"}
+@app.get("/admin/validation/capacity")
+def get_validation_capacity(current_user: DBUser = Depends(get_current_admin_user)):
+    """Current load on the process-wide validation limits, DNS latency and cache hit rates"""
+    return {
+        **validation_governor.stats(),
+        "nameservers": dns_resolver.snapshot(),
+        "caches": {cache.name: cache.stats() for cache in (dns_cache, catch_all_cache, result_cache, sender_auth_cache, dashboard_cache, validation_continuations)},
+    }
+
+@app.post("/admin/validation/domain-lists/reload")
+async def reload_domain_lists(current_user: DBUser = Depends(get_current_admin_user)):
+    """Re-read the domain list files from disk without a restart"""
+    try:
+        counts = await asyncio.to_thread(load_domain_lists)
     except Exception as e:
-        return {"status": "smtp_unreachable", "message": f"SMTP unreachable: {str(e)}"}
+        logger.error(f"Domain list reload failed: {e}")
+        raise HTTPException(status_code=500, detail="Failed to reload domain lists")
+
+    log_user_activity(current_user.id, current_user.username, "reload_domain_lists", "system", f"Reloaded domain lists: {counts}")
+    return {"message": "Domain lists reloaded", "counts": counts, "loaded_at": domain_lists_loaded_at.isoformat()}
+
+# --- Recipient Lists ---
+
+# Stored lists are files of normalized addresses, sorted and deduplicated, so combining lists is
+# a streaming sort-merge (see list_algebra) and never loads a whole list into memory. Each user
+# also has a suppression list; the "suppression" operand is that list plus every address their
+# sends bounced
+RECIPIENT_LISTS_DIR = os.getenv("RECIPIENT_LISTS_DIR", "recipient_lists")
+SUPPRESSION_OPERAND = "suppression"
+suppression_list_locks = {}  # user_id -> asyncio.Lock serializing merges into their suppression list
+
+def recipient_list_path(list_id):
+    return os.path.join(RECIPIENT_LISTS_DIR, f"{list_id}.txt")
+
+def recipient_list_spool_dir():
+    path = os.path.join(RECIPIENT_LISTS_DIR, "tmp")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def get_user_recipient_list(db, list_id, current_user):
+    recipient_list = db.query(RecipientList).filter(RecipientList.id == list_id).first()
+    if not recipient_list or (recipient_list.user_id != current_user.id and current_user.role != "admin"):
+        raise HTTPException(status_code=404, detail="Recipient list not found")
+    return recipient_list
+
+def get_suppression_list(db, user_id):
+    """The user's suppression list, created empty on first use"""
+    query = db.query(RecipientList).filter(RecipientList.user_id == user_id, RecipientList.kind == "suppression")
+    suppression = query.first()
+    if suppression is None:
+        suppression = RecipientList(id=str(uuid.uuid4()), user_id=user_id, name="Suppression list", kind="suppression", total=0)
+        os.makedirs(RECIPIENT_LISTS_DIR, exist_ok=True)
+        open(recipient_list_path(suppression.id), "w").close()
+        db.add(suppression)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another request created it first (uq_recipient_lists_user_suppression); use theirs
+            db.rollback()
+            os.remove(recipient_list_path(suppression.id))
+            return query.one()
+        db.refresh(suppression)
+    return suppression
+
+def read_bounced_addresses(user_id):
+    """Normalized recipients of the user's bounced sends, direct or through their campaigns"""
+    db = SessionLocal()
+    try:
+        query = db.query(EmailLog.recipient_email).filter(EmailLog.status == "bounced", EmailLog.user_id == user_id)
+        for (email,) in query.yield_per(10000):
+            yield normalize_email(email)
+    finally:
+        db.close()
+
+def upload_addresses(spool_path):
+    """Normalized addresses from a spooled upload (one per line, or CSV)"""
+    with open(spool_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            email = extract_job_email(line)
+            if email and len(email) <= EMAIL_MAX_LENGTH and EMAIL_VALIDATION_PATTERN.match(email.strip()):
+                yield normalize_email(email)
+
+async def spool_upload(file):
+    """Copy an upload to a temporary file in RECIPIENT_LISTS_DIR and return its path"""
+    spool = tempfile.NamedTemporaryFile("wb", dir=recipient_list_spool_dir(), suffix=".upload", delete=False)
+    with spool:
+        while True:
+            data = await file.read(1024 * 1024)
+            if not data:
+                break
+            spool.write(data)
+    return spool.name
+
+def store_sorted_upload(spool_path, list_path, merge_with=None):
+    """External-sort an upload into list_path (merged with an existing sorted list); returns the count"""
+    try:
+        addresses = external_sort(upload_addresses(spool_path), directory=recipient_list_spool_dir())
+        if merge_with:
+            addresses = list_union(read_sorted(merge_with), addresses)
+        return write_sorted(list_path, addresses)
+    finally:
+        os.remove(spool_path)
+
+@app.post("/recipient-lists", response_model=RecipientListSchema, status_code=status.HTTP_201_CREATED)
+async def create_recipient_list(file: UploadFile = File(...), name: Optional[str] = None, db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    """Store an uploaded list (one address per line, or CSV) normalized, sorted and deduplicated"""
+    list_id = str(uuid.uuid4())
+    spool_path = await spool_upload(file)
+    total = await asyncio.to_thread(store_sorted_upload, spool_path, recipient_list_path(list_id))
+    if total == 0:
+        os.remove(recipient_list_path(list_id))
+        raise HTTPException(status_code=400, detail="No email addresses found in upload")
+
+    recipient_list = RecipientList(id=list_id, user_id=current_user.id, name=(name or file.filename or "Uploaded list")[:255],
+                                   total=total, source=(file.filename or "")[:255] or None)
+    db.add(recipient_list)
+    db.commit()
+    db.refresh(recipient_list)
+    log_user_activity(current_user.id, current_user.username, "recipient_list", "system", f"Stored recipient list {list_id} ({total} addresses)")
+    return recipient_list
+
+@app.get("/recipient-lists", response_model=List[RecipientListSchema])
+def list_recipient_lists(db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    return db.query(RecipientList).filter(RecipientList.user_id == current_user.id).order_by(RecipientList.created_at.desc()).all()
+
+@app.post("/recipient-lists/suppression", response_model=RecipientListSchema)
+async def add_to_suppression_list(file: UploadFile = File(...), db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    """Merge uploaded addresses into the user's suppression list"""
+    spool_path = await spool_upload(file)
+    # Each merge rewrites the whole list file, so concurrent uploads would lose all but one merge
+    async with suppression_list_locks.setdefault(current_user.id, asyncio.Lock()):
+        suppression = get_suppression_list(db, current_user.id)
+        path = recipient_list_path(suppression.id)
+        suppression.total = await asyncio.to_thread(store_sorted_upload, spool_path, path, merge_with=path)
+        db.commit()
+    db.refresh(suppression)
+    return suppression
+
+@app.post("/recipient-lists/combine", response_model=RecipientListSchema, status_code=status.HTTP_201_CREATED)
+async def combine_recipient_lists(request: RecipientListCombine, db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    """Union, intersection or difference (first minus the rest) of stored lists as a new list"""
+    if request.operation not in LIST_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"operation must be one of: {', '.join(LIST_OPERATIONS)}")
+    if not 2 <= len(request.operands) <= 20:
+        raise HTTPException(status_code=400, detail="Between 2 and 20 operands are required")
+
+    operands = []  # (list path, include bounces)
+    names = []
+    for operand in request.operands:
+        if operand == SUPPRESSION_OPERAND:
+            operands.append((recipient_list_path(get_suppression_list(db, current_user.id).id), True))
+            names.append("suppression")
+        else:
+            recipient_list = get_user_recipient_list(db, operand, current_user)
+            operands.append((recipient_list_path(recipient_list.id), False))
+            names.append(recipient_list.name)
+
+    list_id = str(uuid.uuid4())
+    user_id = current_user.id
+
+    def combine():
+        streams = []
+        for path, include_bounces in operands:
+            stream = read_sorted(path)
+            if include_bounces:
+                stream = list_union(stream, external_sort(read_bounced_addresses(user_id), directory=recipient_list_spool_dir()))
+            streams.append(stream)
+        return write_sorted(recipient_list_path(list_id), LIST_OPERATIONS[request.operation](*streams))
+
+    total = await asyncio.to_thread(combine)
+    source = f"{request.operation}: {', '.join(names)}"
+    recipient_list = RecipientList(id=list_id, user_id=current_user.id, name=(request.name or source)[:255], total=total, source=source[:255])
+    db.add(recipient_list)
+    db.commit()
+    db.refresh(recipient_list)
+    return recipient_list
+
+@app.get("/recipient-lists/{list_id}/download")
+def download_recipient_list(list_id: str, db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    recipient_list = get_user_recipient_list(db, list_id, current_user)
+    path = recipient_list_path(recipient_list.id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Recipient list file is missing")
+
+    def list_chunks():
+        with open(path, "rb") as f:
+            while chunk := f.read(64 * 1024):
+                yield chunk
+
+    return StreamingResponse(list_chunks(), media_type="text/plain", headers={"Content-Disposition": f'attachment; filename="recipients-{recipient_list.id}.txt"'})
+
+@app.delete("/recipient-lists/{list_id}")
+def delete_recipient_list(list_id: str, db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
+    recipient_list = get_user_recipient_list(db, list_id, current_user)
+    if recipient_list.kind == "suppression":
+        raise HTTPException(status_code=400, detail="The suppression list can't be deleted")
+    db.delete(recipient_list)
+    db.commit()
+    try:
+        os.remove(recipient_list_path(list_id))
+    except OSError:
+        pass
+    return {"message": "Recipient list deleted"}
+
 # --- AI Email Generation Endpoint ---
 
 @app.post("/ai/generate-email", response_model=EmailGenerationResponse)
@@ -2162,6 +3244,14 @@ def send_email_to_users_admin(email_data: dict, db: Session = Depends(get_db), c
 
     return {"sent_count": sent_count, "errors": errors}
 
+@app.get("/email/sender-health")
+async def get_sender_health(domain: Optional[str] = None, current_user: DBUser = Depends(get_current_user)):
+    """SPF/DKIM/DMARC health of a sender domain (defaults to the current user's email domain)"""
+    domain = (domain or current_user.email.rsplit('@', 1)[-1]).strip().lower()
+    if not EMAIL_VALIDATION_PATTERN.match(f"postmaster@{domain}"):
+        raise HTTPException(status_code=400, detail="Invalid domain")
+    return await sender_auth.check(domain)
+
 @app.post("/api/send-email")
 async def send_email(email_request: EmailRequest, db: Session = Depends(get_db), current_user: DBUser = Depends(get_current_user)):
     logger.info(f"Email request received: from={email_request.from_email}, to={email_request.to_email}, subject={email_request.subject}")
@@ -2174,6 +3264,23 @@ async def send_email(email_request: EmailRequest, db: Session = Depends(get_db),
             detail="SendGrid API key not configured. Please configure SENDGRID_API_KEY in environment variables."
         )
     
+    from_email = email_request.from_email or current_user.email
+
+    # Check the sender domain before counting the attempt, so a refused send doesn't use up the rate limit
+    sender_health = await sender_auth.check(from_email.rsplit('@', 1)[1])
+    if sender_health["status"] == "fail":
+        problems = "; ".join(i["message"] for i in sender_health["issues"] if i["severity"] == "error")
+        if SENDER_AUTH_ENFORCE:
+            raise HTTPException(status_code=422, detail=f"Sender domain {sender_health['domain']} is not ready to send: {problems}")
+        logger.warning(f"Sending from {sender_health['domain']} despite failing sender checks: {problems}")
+
+    # When asked, refuse recipients that definitely can't receive mail: bad syntax, listed
+    # domains or no MX. SMTP verdicts (including cached ones) never block a send
+    if email_request.validate_recipient:
+        recipient_result = await validate_single_email(email_request.to_email, mode="dns", user_key=current_user.id)
+        if not recipient_result.valid and recipient_result.depth in ("syntax", "dns"):
+            raise HTTPException(status_code=422, detail=f"Recipient {email_request.to_email} is undeliverable: {recipient_result.reason}")
+
     # Email rate limiting
     now = datetime.now(timezone.utc)
     user_key = f"email_{current_user.id}"
@@ -2193,9 +3300,7 @@ async def send_email(email_request: EmailRequest, db: Session = Depends(get_db),
         email_attempts[user_key] = attempts
     else:
         email_attempts[user_key] = [now]
-    
-    from_email = email_request.from_email or current_user.email
-    
+
     try:
         sg = sendgrid.SendGridAPIClient(api_key=SENDGRID_API_KEY)
         
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Backfill email_logs.user_id for campaign sends and make it required.
+
+Older campaign sends were logged with only campaign_id set. This copies the campaign's
+owner onto those rows in id-range batches (short transactions, so sending can continue),
+then makes user_id NOT NULL and drops the old user-or-campaign constraint. Afterwards
+rebuild the rollup with backfill_email_rollup.py, since the rollup keys on user_id too,
+and run `alembic upgrade head` for the (user_id, sent_at) index. Safe to re-run.
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import text
+
+from database import engine
+
+BATCH_SIZE = 50000
+
+def migrate_email_log_owner():
+    postgres = engine.dialect.name == "postgresql"
+
+    with engine.connect() as conn:
+        max_id = conn.execute(text("SELECT MAX(id) FROM email_logs")).scalar() or 0
+
+    print(f"Backfilling user_id on campaign email logs (ids up to {max_id})...")
+    updated = 0
+    for start in range(0, max_id + 1, BATCH_SIZE):
+        with engine.begin() as conn:
+            result = conn.execute(text("""
+                UPDATE email_logs
+                SET user_id = (SELECT campaigns.user_id FROM campaigns WHERE campaigns.id = email_logs.campaign_id)
+                WHERE user_id IS NULL AND campaign_id IS NOT NULL AND id >= :start AND id < :stop
+            """), {"start": start, "stop": start + BATCH_SIZE})
+            updated += result.rowcount
+    print(f"  {updated} rows updated")
+
+    with engine.begin() as conn:
+        orphans = conn.execute(text("SELECT COUNT(*) FROM email_logs WHERE user_id IS NULL")).scalar()
+        if orphans:
+            raise RuntimeError(f"{orphans} email logs have no user and no campaign owner; fix or delete them first")
+
+        if postgres:
+            # SQLite can't alter column constraints in place; new SQLite databases get them from the models
+            print("Making email_logs.user_id NOT NULL...")
+            conn.execute(text("ALTER TABLE email_logs ALTER COLUMN user_id SET NOT NULL"))
+            conn.execute(text("ALTER TABLE email_logs DROP CONSTRAINT IF EXISTS check_user_or_campaign"))
+
+    print("Migration completed successfully! Now run backfill_email_rollup.py")
+
+if __name__ == "__main__":
+    migrate_email_log_owner()
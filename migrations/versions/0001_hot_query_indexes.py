@@ -0,0 +1,88 @@
+"""Indexes for the hot email log, campaign and chat queries
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+Tables are still created by Base.metadata.create_all at startup, so a new database already
+has these indexes (they're declared in models.py) and a table that doesn't exist yet is
+skipped here. On PostgreSQL every index is built with CREATE INDEX CONCURRENTLY outside a
+transaction, so writes to email_logs continue while it runs. A concurrent build that was
+interrupted leaves an INVALID index behind; it's dropped and rebuilt on the next upgrade.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, dialect options) - keep in step with __table_args__ in models.py
+INDEXES = (
+    # /dashboard/recent-emails, bounced-address lists: user_id = ? ORDER BY sent_at DESC
+    ("ix_email_logs_user_id_sent_at", "email_logs", ["user_id", sa.text("sent_at DESC")], {}),
+    # /admin/email-logs?status=: status = ? ORDER BY sent_at DESC
+    ("ix_email_logs_status_sent_at", "email_logs", ["status", "sent_at"], {}),
+    # Campaign deletes remove the campaign's logs
+    ("ix_email_logs_campaign_id", "email_logs", ["campaign_id"], {}),
+    # Retention cleanup (sent_at < cutoff); rows arrive in sent_at order, so a BRIN index is tiny
+    ("ix_email_logs_sent_at_brin", "email_logs", ["sent_at"], {"postgresql_using": "brin"}),
+    # Dashboard campaign count and recent campaigns: user_id = ? ORDER BY created_at DESC
+    ("ix_campaigns_user_id_created_at", "campaigns", ["user_id", sa.text("created_at DESC")], {}),
+    # /chat/messages/{room_id}: room_id = ? ORDER BY created_at DESC
+    ("ix_chat_messages_room_id_created_at", "chat_messages", ["room_id", sa.text("created_at DESC")], {}),
+    ("ix_chat_messages_created_at_brin", "chat_messages", ["created_at"], {"postgresql_using": "brin"}),
+)
+
+# Superseded by ix_email_logs_user_id_sent_at, whose leading column serves the same lookups
+SUPERSEDED_INDEXES = (
+    ("ix_email_logs_user_id", "email_logs", ["user_id"]),
+)
+
+
+def _existing_tables():
+    if context.is_offline_mode():
+        return {table for _, table, _, _ in INDEXES}
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _drop_if_invalid(name):
+    if context.is_offline_mode() or op.get_bind().dialect.name != "postgresql":
+        return
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+        "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+    ), {"name": name}).scalar()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = _existing_tables()
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            if table not in tables:
+                continue
+            _drop_if_invalid(name)
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True, **options)
+        for name, table, _ in SUPERSEDED_INDEXES:
+            if table in tables:
+                op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = _existing_tables()
+    with op.get_context().autocommit_block():
+        for name, table, columns in SUPERSEDED_INDEXES:
+            if table in tables:
+                op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+        for name, table, _, _ in reversed(INDEXES):
+            if table in tables:
+                op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
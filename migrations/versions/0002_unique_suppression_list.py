@@ -0,0 +1,67 @@
+"""One suppression list per user
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+Two requests that both found no suppression list could each create one. This adds a partial
+unique index on recipient_lists.user_id for kind = 'suppression' (declared in models.py), so
+the second insert fails and get_suppression_list re-reads the winner's list. Users who already
+have duplicates must have them merged or deleted first; the upgrade stops and names them.
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "uq_recipient_lists_user_suppression"
+SUPPRESSION_ONLY = sa.text("kind = 'suppression'")
+
+
+def _table_exists():
+    if context.is_offline_mode():
+        return True
+    return "recipient_lists" in sa.inspect(op.get_bind()).get_table_names()
+
+
+def _check_duplicates():
+    if context.is_offline_mode():
+        return
+    duplicated = op.get_bind().execute(sa.text(
+        "SELECT user_id FROM recipient_lists WHERE kind = 'suppression' GROUP BY user_id HAVING COUNT(*) > 1"
+    )).scalars().all()
+    if duplicated:
+        raise RuntimeError(f"Users {duplicated} have more than one suppression list; merge or delete the extras first")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _table_exists():
+        return
+    _check_duplicates()
+    with op.get_context().autocommit_block():
+        if not context.is_offline_mode() and op.get_bind().dialect.name == "postgresql":
+            # An interrupted concurrent build leaves an INVALID index behind
+            invalid = op.get_bind().execute(sa.text(
+                "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+                "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+            ), {"name": INDEX_NAME}).scalar()
+            if invalid:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+        op.create_index(INDEX_NAME, "recipient_lists", ["user_id"], unique=True, if_not_exists=True,
+                        postgresql_where=SUPPRESSION_ONLY, sqlite_where=SUPPRESSION_ONLY, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _table_exists():
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name="recipient_lists", if_exists=True, postgresql_concurrently=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, CheckConstraint, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, CheckConstraint, UniqueConstraint, Index, event, select, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -50,6 +50,7 @@ class Campaign(Base):
     __table_args__ = (
         CheckConstraint("status IN ('draft', 'sending', 'completed', 'failed')", name="check_campaign_status"),
         CheckConstraint("length(name) > 0", name="check_campaign_name_not_empty"),
+        Index("ix_campaigns_user_id_created_at", "user_id", text("created_at DESC")),  # A user's campaigns, newest first
     )
 
     # Relationships
@@ -60,7 +61,7 @@ class EmailLog(Base):
     __tablename__ = "email_logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Add user_id for individual emails
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Owning user, for campaign sends too
     campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=True)
     recipient_email = Column(String(254), nullable=False)
     status = Column(String(20), default="sent", nullable=False)  # 'sent', 'failed', 'bounced'
@@ -69,13 +70,41 @@ class EmailLog(Base):
 
     __table_args__ = (
         CheckConstraint("status IN ('sent', 'failed', 'bounced')", name="check_email_status"),
-        CheckConstraint("(user_id IS NOT NULL) OR (campaign_id IS NOT NULL)", name="check_user_or_campaign"),
+        # Created on existing databases by migrations/versions/0001_hot_query_indexes.py
+        Index("ix_email_logs_user_id_sent_at", "user_id", text("sent_at DESC")),  # A user's recent sends
+        Index("ix_email_logs_status_sent_at", "status", "sent_at"),  # Admin log filter by status
+        Index("ix_email_logs_campaign_id", "campaign_id"),  # Campaign deletes
+        Index("ix_email_logs_sent_at_brin", "sent_at", postgresql_using="brin"),  # Retention cleanup on the append-only log
     )
 
     # Relationships
     user = relationship("User", backref="email_logs")
     campaign = relationship("Campaign", backref="email_logs")
 
+@event.listens_for(EmailLog, "before_insert")
+def set_email_log_owner(mapper, connection, target):
+    # Campaign sends are owned by the campaign's user, so per-user queries never need a join
+    if target.user_id is None and target.campaign_id is not None:
+        target.user_id = connection.scalar(select(Campaign.user_id).where(Campaign.id == target.campaign_id))
+
+class EmailStatsRollup(Base):
+    __tablename__ = "email_stats_rollup"
+
+    # Hourly counts per owner and status, kept in step with email_logs by email_rollup.
+    # No foreign keys: stats outlive pruned logs. Rows are additive - always SUM(count)
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=True)
+    campaign_id = Column(Integer, nullable=True)
+    bucket_hour = Column(DateTime, nullable=False)  # sent_at truncated to the hour (UTC)
+    status = Column(String(20), nullable=False)
+    count = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        Index("ix_email_stats_rollup_user_bucket", "user_id", "bucket_hour"),
+        Index("ix_email_stats_rollup_campaign_bucket", "campaign_id", "bucket_hour"),
+        Index("ix_email_stats_rollup_bucket", "bucket_hour"),
+    )
+
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
@@ -88,6 +117,11 @@ class ChatMessage(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     is_read = Column(Boolean, default=False)
 
+    __table_args__ = (
+        Index("ix_chat_messages_room_id_created_at", "room_id", text("created_at DESC")),  # Room history, newest first
+        Index("ix_chat_messages_created_at_brin", "created_at", postgresql_using="brin"),  # Retention cleanup
+    )
+
     # Relationships
     sender = relationship("User", foreign_keys=[sender_id], backref="sent_messages")
     recipient = relationship("User", foreign_keys=[recipient_id], backref="received_messages")
@@ -107,4 +141,49 @@ class UserEmail(Base):
     )
 
     # Relationships
-    user = relationship("User", backref="user_emails")
\ No newline at end of file
+    user = relationship("User", backref="user_emails")
+
+class ValidationJob(Base):
+    __tablename__ = "validation_jobs"
+
+    id = Column(String(36), primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    filename = Column(String(255), nullable=True)
+    status = Column(String(20), default="queued", nullable=False)  # 'queued', 'running', 'completed', 'failed'
+    total = Column(Integer, default=0, nullable=False)
+    processed = Column(Integer, default=0, nullable=False)  # Checkpoint - results already written to disk
+    valid_count = Column(Integer, default=0, nullable=False)
+    deliverable_count = Column(Integer, default=0, nullable=False)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("status IN ('queued', 'running', 'completed', 'failed')", name="check_validation_job_status"),
+    )
+
+    # Relationships
+    user = relationship("User", backref="validation_jobs")
+
+class RecipientList(Base):
+    __tablename__ = "recipient_lists"
+
+    id = Column(String(36), primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    kind = Column(String(20), default="list", nullable=False)  # 'list' or 'suppression' (one per user)
+    total = Column(Integer, default=0, nullable=False)
+    source = Column(String(255), nullable=True)  # Upload filename or the operation that produced the list
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("kind IN ('list', 'suppression')", name="check_recipient_list_kind"),
+        # At most one suppression list per user, even when two requests create it at once
+        Index("uq_recipient_lists_user_suppression", "user_id", unique=True,
+              postgresql_where=text("kind = 'suppression'"), sqlite_where=text("kind = 'suppression'")),
+    )
+
+    # Relationships
+    user = relationship("User", backref="recipient_lists")
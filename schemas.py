@@ -57,6 +57,7 @@ class EmailRequest(BaseModel):
     template_id: Optional[str] = None
     sendgrid_template_id: Optional[str] = None
     dynamic_template_data: Optional[dict] = None
+    validate_recipient: bool = False  # Refuse recipients that fail syntax or DNS checks
 
 # Template schemas
 class TemplateBase(BaseModel):
@@ -172,15 +173,59 @@ class ComprehensiveAnalytics(BaseModel):
 # Email validation
 class EmailValidationRequest(BaseModel):
     emails: List[str]
+    force_refresh: bool = False  # Skip the result cache and re-check every address
+    mode: str = "smtp"  # syntax, dns, smtp or full - how deep to check each address
+    time_budget: Optional[float] = None  # Seconds; unfinished addresses return at the depth reached
+    deadline: Optional[float] = None  # Seconds; unfinished addresses return as pending and finish in the background
 
 class EmailValidationResult(BaseModel):
     email: str
     valid: bool
     deliverable: bool
     reason: Optional[str] = None
+    cached: bool = False
+    cache_age: Optional[float] = None  # Seconds since the cached result was computed
+    depth: Optional[str] = None  # Deepest check reached: syntax, dns or smtp
+    pending: bool = False  # Still being checked - collect it with the response's continuation_token
+    suggestion: Optional[str] = None  # "Did you mean" address when the domain looks like a typo
 
 class EmailValidationResponse(BaseModel):
     results: List[EmailValidationResult]
+    continuation_token: Optional[str] = None
+
+class ValidationJob(BaseModel):
+    id: str
+    filename: Optional[str] = None
+    status: str
+    total: int
+    processed: int
+    valid_count: int
+    deliverable_count: int
+    error_message: Optional[str] = None
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# Recipient lists
+class RecipientList(BaseModel):
+    id: str
+    name: str
+    kind: str
+    total: int
+    source: Optional[str] = None
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class RecipientListCombine(BaseModel):
+    operation: str  # 'union', 'intersection' or 'difference' (first operand minus the rest)
+    operands: List[str]  # Recipient list ids, or "suppression" for the suppression set
+    name: Optional[str] = None
 
 # AI Email Generation
 class EmailGenerationRequest(BaseModel):
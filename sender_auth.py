@@ -0,0 +1,225 @@
+"""
+Sender-domain authentication health (SPF, DKIM, DMARC).
+
+Looks up a From domain's SPF record, its DMARC policy and DKIM keys on a list of common
+selectors through the async resolver, and reports what will go wrong before mail is sent.
+TXT answers are cached for their DNS TTL (negative answers for the SOA's negative TTL).
+
+DMARC passes only if SPF or DKIM passes *aligned* with the From domain. Mail relayed
+through an ESP carries the ESP's envelope sender, so SPF alignment depends on a
+return-path setup we can't see from DNS; a DKIM key published on the From domain is what
+makes alignment possible. A domain enforcing DMARC (quarantine/reject) with no DKIM key
+on any known selector is therefore reported as failing.
+"""
+
+import asyncio
+import logging
+
+from async_resolver import DNSLookupError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DKIM_SELECTORS = (
+    "s1", "s2",                # SendGrid domain authentication
+    "google",                  # Google Workspace
+    "selector1", "selector2",  # Microsoft 365
+    "k1", "k2",                # Mailchimp / Mandrill
+    "default", "dkim", "mail",
+)
+
+SPF_MAX_LOOKUPS = 10  # RFC 7208 4.6.4 - more is a permerror
+SPF_LOOKUP_MECHANISMS = ("include", "a", "mx", "ptr", "exists", "redirect")
+SPF_MAX_DEPTH = 10
+
+
+def parse_tags(record):
+    """Parse a "k=v; k=v" tag list (DMARC, DKIM) into a dict with lower-case keys"""
+    tags = {}
+    for part in record.split(";"):
+        key, sep, value = part.partition("=")
+        if sep:
+            tags[key.strip().lower()] = value.strip()
+    return tags
+
+
+def parse_spf(record):
+    """Split an SPF record into (qualifier, mechanism, value) terms; modifiers use "=" """
+    terms = []
+    for term in record.split()[1:]:
+        qualifier = "+"
+        if term[0] in "+-~?":
+            qualifier, term = term[0], term[1:]
+        name, sep, value = term.partition("=")
+        if not sep:
+            name, _, value = term.partition(":")
+        terms.append((qualifier, name.split("/", 1)[0].lower(), value))  # "a/24" is the a mechanism
+    return terms
+
+
+def organizational_domain(domain):
+    """Approximate organizational domain (last two labels) for the DMARC fallback lookup"""
+    return ".".join(domain.split(".")[-2:])
+
+
+class SenderAuthChecker:
+    """Evaluate SPF/DKIM/DMARC for sender domains with TTL-cached TXT lookups
+
+    cache is a TTLCache shared across checks; ttl bounds clamp the DNS TTLs so a zero TTL
+    doesn't defeat caching and a week-long one doesn't hide a fixed record.
+    """
+
+    def __init__(self, resolver, cache, dkim_selectors=DEFAULT_DKIM_SELECTORS,
+                 service_spf_includes=(), min_ttl=60, max_ttl=3600, negative_ttl=300):
+        self.resolver = resolver
+        self.cache = cache
+        self.dkim_selectors = tuple(dkim_selectors)
+        self.service_spf_includes = tuple(d.lower() for d in service_spf_includes)
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+
+    def _cache_ttl(self, answer):
+        records, ttl = answer
+        if ttl is None:
+            ttl = self.negative_ttl if not records else self.min_ttl
+        return min(self.max_ttl, max(self.min_ttl, ttl))
+
+    async def txt(self, name):
+        """Cached TXT strings for name"""
+        name = name.rstrip(".").lower()
+        records, _ = await self.cache.get_or_load(
+            ("TXT", name), lambda: self.resolver.resolve_txt(name), ttl=self._cache_ttl
+        )
+        return records
+
+    async def _spf_record(self, domain):
+        return [r for r in await self.txt(domain) if r.lower().split(" ", 1)[0] == "v=spf1"]
+
+    async def _spf_lookups(self, terms, seen, depth):
+        """DNS-querying terms in an SPF record, following include/redirect; also collects included domains"""
+        lookups = 0
+        for _, name, value in terms:
+            if name not in SPF_LOOKUP_MECHANISMS:
+                continue
+            lookups += 1
+            if name not in ("include", "redirect") or depth >= SPF_MAX_DEPTH:
+                continue
+            target = value.lower()
+            if target in seen:
+                continue
+            seen.add(target)
+            records = await self._spf_record(target)
+            if len(records) == 1:
+                lookups += await self._spf_lookups(parse_spf(records[0]), seen, depth + 1)
+            if lookups > SPF_MAX_LOOKUPS:
+                break
+        return lookups
+
+    async def check_spf(self, domain):
+        records = await self._spf_record(domain)
+        if not records:
+            return {"record": None, "status": "missing"}
+        if len(records) > 1:
+            return {"record": records, "status": "permerror", "error": "Multiple SPF records"}
+
+        terms = parse_spf(records[0])
+        included = set()
+        lookups = await self._spf_lookups(terms, included, 0)
+        all_qualifier = next((q for q, name, _ in terms if name == "all"), None)
+        spf = {
+            "record": records[0],
+            "status": "permerror" if lookups > SPF_MAX_LOOKUPS else "ok",
+            "lookups": lookups,
+            "all": all_qualifier,
+        }
+        if self.service_spf_includes:
+            spf["authorizes_service"] = any(d in included for d in self.service_spf_includes)
+        if lookups > SPF_MAX_LOOKUPS:
+            spf["error"] = f"SPF needs more than {SPF_MAX_LOOKUPS} DNS lookups"
+        return spf
+
+    async def check_dmarc(self, domain):
+        source = domain
+        records = [r for r in await self.txt(f"_dmarc.{domain}") if r.lower().startswith("v=dmarc1")]
+        org_domain = organizational_domain(domain)
+        if not records and org_domain != domain:
+            source = org_domain
+            records = [r for r in await self.txt(f"_dmarc.{org_domain}") if r.lower().startswith("v=dmarc1")]
+        if len(records) != 1:
+            return {"record": None, "policy": None, "status": "missing" if not records else "invalid"}
+
+        tags = parse_tags(records[0])
+        policy = tags.get("p", "").lower()
+        if source != domain:
+            policy = tags.get("sp", policy).lower()  # Subdomain policy from the organizational record
+        return {
+            "record": records[0],
+            "source": source,
+            "policy": policy or None,
+            "adkim": tags.get("adkim", "r").lower(),
+            "aspf": tags.get("aspf", "r").lower(),
+            "pct": int(tags["pct"]) if tags.get("pct", "").isdigit() else 100,
+            "status": "ok" if policy in ("none", "quarantine", "reject") else "invalid",
+        }
+
+    async def check_dkim(self, domain):
+        async def lookup(selector):
+            try:
+                records = await self.txt(f"{selector}._domainkey.{domain}")
+            except DNSLookupError:
+                return None
+            for record in records:
+                tags = parse_tags(record)
+                if "p" in tags:
+                    return {"selector": selector, "revoked": not tags["p"]}
+            return None
+
+        found = [key for key in await asyncio.gather(*(lookup(s) for s in self.dkim_selectors)) if key]
+        return {
+            "selectors": [key["selector"] for key in found if not key["revoked"]],
+            "revoked": [key["selector"] for key in found if key["revoked"]],
+            "checked": list(self.dkim_selectors),
+        }
+
+    async def check(self, domain):
+        """Health report for a sender domain; status is pass, warn, fail or unknown"""
+        domain = domain.rstrip(".").lower()
+        try:
+            spf, dmarc, dkim = await asyncio.gather(
+                self.check_spf(domain), self.check_dmarc(domain), self.check_dkim(domain)
+            )
+        except DNSLookupError as e:
+            logger.warning(f"Sender auth lookup failed for {domain}: {e}")
+            return {"domain": domain, "status": "unknown", "issues": [{"severity": "warning", "message": f"DNS lookup failed: {e}"}]}
+
+        issues = []
+
+        def issue(severity, message):
+            issues.append({"severity": severity, "message": message})
+
+        if spf["status"] == "missing":
+            issue("warning", "No SPF record")
+        elif spf["status"] == "permerror":
+            issue("warning", f"SPF permerror: {spf['error']}")
+        elif spf.get("authorizes_service") is False and spf["all"] == "-":
+            issue("warning", "SPF hard-fails (-all) without authorizing the sending service")
+
+        if dmarc["status"] == "missing":
+            issue("warning", "No DMARC record; bulk mailbox providers require one")
+        elif dmarc["status"] == "invalid":
+            issue("warning", "DMARC record is invalid")
+
+        if not dkim["selectors"]:
+            if dmarc["policy"] in ("quarantine", "reject"):
+                issue("error", f"DMARC policy is {dmarc['policy']} but no DKIM key was found on the domain; "
+                               "mail will fail DMARC alignment")
+            else:
+                issue("warning", "No DKIM key found on common selectors")
+
+        if any(i["severity"] == "error" for i in issues):
+            status = "fail"
+        elif issues:
+            status = "warn"
+        else:
+            status = "pass"
+        return {"domain": domain, "status": status, "spf": spf, "dmarc": dmarc, "dkim": dkim, "issues": issues}
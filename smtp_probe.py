@@ -0,0 +1,275 @@
+"""
+Native asyncio SMTP probe client for mailbox verification.
+
+Probes speak just enough SMTP (EHLO/HELO, MAIL FROM, RCPT TO, RSET, QUIT) to ask a
+mail server whether it accepts a recipient. Connections are capped per MX host and
+globally, and new connections to the same host are spaced out by a politeness delay
+so large batches never hammer a single server into tarpitting us.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPProbeError(Exception):
+    """Raised when a probe session can't continue (bad greeting, protocol error)"""
+
+
+class SMTPProbeDisconnected(SMTPProbeError):
+    """Raised when the server closes the connection mid-session"""
+
+
+class SMTPProbeSession:
+    """A single SMTP connection used to send successive probe commands"""
+
+    def __init__(self, reader, writer, timeout):
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+
+    @classmethod
+    async def open(cls, host, port, timeout):
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+        session = cls(reader, writer, timeout)
+        code, message = await session.read_reply()
+        if code != 220:
+            await session.close()
+            raise SMTPProbeError(f"Unexpected greeting {code}: {message}")
+        return session
+
+    async def read_reply(self):
+        """Read a (possibly multi-line) reply and return (code, message)"""
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), timeout=self.timeout)
+            if not line:
+                raise SMTPProbeDisconnected("Connection closed by server")
+            line = line.decode('utf-8', errors='replace').rstrip('\r\n')
+            if len(line) < 3 or not line[:3].isdigit():
+                raise SMTPProbeError(f"Malformed reply: {line[:100]}")
+            lines.append(line[4:])
+            if len(line) == 3 or line[3] != '-':
+                return int(line[:3]), '\n'.join(lines)
+
+    async def command(self, line):
+        self.writer.write(f"{line}\r\n".encode('utf-8'))
+        await asyncio.wait_for(self.writer.drain(), timeout=self.timeout)
+        code, message = await self.read_reply()
+        if code == 421:
+            # Service not available - server is closing the channel
+            raise SMTPProbeDisconnected(f"Server closing connection: {message}")
+        return code, message
+
+    async def hello(self, helo_name):
+        code, _ = await self.command(f"EHLO {helo_name}")
+        if code != 250:
+            code, message = await self.command(f"HELO {helo_name}")
+            if code != 250:
+                raise SMTPProbeError(f"HELO rejected with code {code}: {message}")
+
+    async def mail(self, sender):
+        code, message = await self.command(f"MAIL FROM:<{sender}>")
+        if code != 250:
+            raise SMTPProbeError(f"MAIL FROM rejected with code {code}: {message}")
+
+    async def rcpt(self, email_address):
+        return await self.command(f"RCPT TO:<{email_address}>")
+
+    async def rset(self):
+        return await self.command("RSET")
+
+    async def close(self):
+        try:
+            if not self.writer.is_closing():
+                self.writer.write(b"QUIT\r\n")
+                await asyncio.wait_for(self.writer.drain(), timeout=1.0)
+        except Exception:
+            pass
+        finally:
+            self.writer.close()
+            try:
+                await asyncio.wait_for(self.writer.wait_closed(), timeout=1.0)
+            except Exception:
+                pass
+
+
+class _HostState:
+    """Connection bookkeeping for a single MX host"""
+
+    def __init__(self, max_connections):
+        self.semaphore = asyncio.Semaphore(max_connections)
+        self.connect_lock = asyncio.Lock()
+        self.next_connect_at = 0.0
+        self.in_use = 0
+        self.last_used = 0.0
+
+
+class SMTPProber:
+    """Async SMTP prober with global and per-MX-host connection limits
+
+    probe() verifies a list of addresses that share one MX host over a single session,
+    sending many RCPT TOs per envelope, issuing RSET when a transaction reaches
+    max_rcpt_per_transaction or the server answers 452, and recycling the connection
+    after max_rcpt_per_session recipients. Catch-all detection is delegated to the
+    catch_all_lookup/catch_all_store callables so status can be cached per domain.
+    """
+
+    MAX_TRACKED_HOSTS = 5000
+
+    def __init__(self, helo_name, sender, port=25, timeout=8.0,
+                 max_connections=200, max_connections_per_host=3, politeness_delay=0.25,
+                 max_rcpt_per_transaction=100, max_rcpt_per_session=500, max_reconnects=2,
+                 catch_all_lookup=None, catch_all_store=None):
+        self.helo_name = helo_name
+        self.sender = sender
+        self.port = port
+        self.timeout = timeout
+        self.max_connections_per_host = max_connections_per_host
+        self.politeness_delay = politeness_delay
+        self.max_rcpt_per_transaction = max_rcpt_per_transaction
+        self.max_rcpt_per_session = max_rcpt_per_session
+        self.max_reconnects = max_reconnects
+        self.catch_all_lookup = catch_all_lookup or (lambda domain: None)
+        self.catch_all_store = catch_all_store or (lambda domain, is_catch_all: None)
+        self._global_semaphore = asyncio.Semaphore(max_connections)
+        self._hosts = {}
+        self.open_sockets = 0
+
+    def _host_state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            if len(self._hosts) >= self.MAX_TRACKED_HOSTS:
+                # Forget idle hosts so the table doesn't grow without bound
+                idle_hosts = [h for h, s in self._hosts.items() if s.in_use == 0]
+                idle_hosts.sort(key=lambda h: self._hosts[h].last_used)
+                for h in idle_hosts[:len(idle_hosts) // 2 or 1]:
+                    del self._hosts[h]
+            state = self._hosts[host] = _HostState(self.max_connections_per_host)
+        return state
+
+    @asynccontextmanager
+    async def _connection(self, host):
+        """Open a session honouring the per-host cap, politeness delay and global socket cap"""
+        state = self._host_state(host)
+        state.in_use += 1
+        try:
+            async with state.semaphore:
+                async with state.connect_lock:
+                    delay = state.next_connect_at - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    state.next_connect_at = time.monotonic() + self.politeness_delay
+
+                async with self._global_semaphore:
+                    session = await SMTPProbeSession.open(host, self.port, self.timeout)
+                    self.open_sockets += 1
+                    try:
+                        yield session
+                    finally:
+                        self.open_sockets -= 1
+                        await session.close()
+        finally:
+            state.in_use -= 1
+            state.last_used = time.monotonic()
+
+    async def probe(self, mail_server, email_addresses, on_result=None):
+        """Verify addresses sharing one MX host; returns {email: {"status", "message"}}
+
+        Status is verified, catch_all, not_verified, deferred (4xx reply - retry later) or
+        smtp_unreachable. on_result(email, result) is called as soon as each address is
+        decided, so callers can stream results instead of waiting for the whole session.
+        """
+        host = mail_server.rstrip('.').lower()
+        results = {}
+        remaining = deque(dict.fromkeys(email_addresses))
+        failed_connects = 0
+
+        def record(email_address, result):
+            results[email_address] = result
+            if on_result:
+                on_result(email_address, result)
+
+        def mark_unreachable(error):
+            for email_address in remaining:
+                record(email_address, {"status": "smtp_unreachable", "message": f"SMTP unreachable: {str(error) or type(error).__name__}"})
+
+        while remaining:
+            session_rcpts = 0
+            try:
+                async with self._connection(host) as session:
+                    await session.hello(self.helo_name)
+                    await session.mail(self.sender)
+                    transaction_rcpts = 0
+
+                    while remaining and session_rcpts < self.max_rcpt_per_session:
+                        email_address = remaining[0]
+                        if transaction_rcpts >= self.max_rcpt_per_transaction:
+                            await session.rset()
+                            await session.mail(self.sender)
+                            transaction_rcpts = 0
+
+                        # Check the actual email address
+                        code_real, reply = await session.rcpt(email_address)
+                        transaction_rcpts += 1
+                        if code_real == 452 and transaction_rcpts > 1:
+                            # Server-side recipient limit hit - start a fresh envelope and retry
+                            await session.rset()
+                            await session.mail(self.sender)
+                            code_real, reply = await session.rcpt(email_address)
+                            transaction_rcpts = 1
+
+                        if 400 <= code_real < 500:
+                            # Temporary failure (greylisting, rate limiting) says nothing about the mailbox
+                            record(email_address, {"status": "deferred", "message": f"Deferred with code {code_real}: {reply}"})
+                        elif code_real != 250:
+                            # If the real email is rejected, we know it's not valid
+                            record(email_address, {"status": "not_verified", "message": f"Mailbox rejected with code {code_real}"})
+                        else:
+                            # Probe a random mailbox only when the domain's catch-all status isn't cached
+                            domain = email_address.rsplit('@', 1)[1].lower()
+                            is_catch_all = self.catch_all_lookup(domain)
+                            if is_catch_all is None:
+                                fake_address = f"{uuid.uuid4().hex[:16]}@{domain}"
+                                code_fake, fake_reply = await session.rcpt(fake_address)
+                                transaction_rcpts += 1
+                                if code_fake == 452 and transaction_rcpts > 1:
+                                    await session.rset()
+                                    await session.mail(self.sender)
+                                    code_fake, fake_reply = await session.rcpt(fake_address)
+                                    transaction_rcpts = 1
+                                # Only a definite answer settles catch-all status; a 4xx is cached as nothing
+                                if code_fake == 250 or code_fake >= 500:
+                                    is_catch_all = code_fake == 250
+                                    self.catch_all_store(domain, is_catch_all)
+
+                            if is_catch_all is None:
+                                record(email_address, {"status": "deferred", "message": f"Catch-all check deferred with code {code_fake}: {fake_reply}"})
+                            elif is_catch_all:
+                                record(email_address, {"status": "catch_all", "message": "Domain is a catch-all"})
+                            else:
+                                record(email_address, {"status": "verified", "message": "Mailbox exists"})
+
+                        remaining.popleft()
+                        session_rcpts += 1
+
+            except SMTPProbeDisconnected as e:
+                # Some servers cap recipients per connection by hanging up; reconnect while we make progress
+                failed_connects = 0 if session_rcpts else failed_connects + 1
+                if failed_connects > self.max_reconnects:
+                    mark_unreachable(e)
+                    break
+            except (SMTPProbeError, asyncio.TimeoutError, ConnectionError, OSError) as e:
+                mark_unreachable(e)
+                break
+            except Exception as e:
+                logger.warning(f"Unexpected SMTP probe error for {host}: {e}")
+                mark_unreachable(e)
+                break
+
+        return results
@@ -54,10 +54,10 @@ const API = {
         }
     },
 
-    async sendEmail(fromEmail, toEmail, subject, body) {
+    async sendEmail(fromEmail, toEmail, subject, body, { validateRecipient = false } = {}) {
         return await API.fetch('/api/send-email', {
             method: 'POST',
-            body: JSON.stringify({ from_email: fromEmail, to_email: toEmail, subject: subject, body: body })
+            body: JSON.stringify({ from_email: fromEmail, to_email: toEmail, subject: subject, body: body, validate_recipient: validateRecipient })
         });
     },
 
@@ -116,6 +116,54 @@ const API = {
         });
     },
 
+    // Streams NDJSON results from /email/validate/stream, calling onResult(result) as each one arrives
+    async validateEmailsStream(emails, onResult) {
+        const token = Auth.getToken();
+        const headers = { 'Content-Type': 'application/json' };
+        if (token) headers['Authorization'] = `Bearer ${token}`;
+
+        const response = await fetch(`${CONFIG.BACKEND_URL}/email/validate/stream`, {
+            method: 'POST',
+            headers,
+            body: JSON.stringify({ emails: emails })
+        });
+
+        if (!response.ok) {
+            if (response.status === 401) {
+                Auth.clearAuth();
+                throw new Error('Session expired. Please log in again.');
+            }
+            let detail = response.statusText || 'Request failed';
+            try {
+                detail = (await response.json()).detail || detail;
+            } catch (jsonError) {
+                // Keep status text
+            }
+            const error = new Error(detail);
+            error.status = response.status;
+            error.retryAfter = Number(response.headers.get('Retry-After')) || null;  // Seconds, sent with 429
+            throw error;
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let newline;
+            while ((newline = buffer.indexOf('\n')) >= 0) {
+                const line = buffer.slice(0, newline).trim();
+                buffer = buffer.slice(newline + 1);
+                if (line) onResult(JSON.parse(line));
+            }
+        }
+        if (buffer.trim()) onResult(JSON.parse(buffer));
+    },
+
     async getTemplates() {
         return await API.fetch('/templates');
     },
@@ -1,5 +1,20 @@
 // Campaign Management Module
 const Campaign = {
+    VALIDATION_BATCH_SIZE: 1000,  // Server maximum per /email/validate/stream request
+    VALIDATION_MAX_ATTEMPTS: 5,  // Tries per batch when validation is saturated (429) or the stream breaks
+    VALIDATION_BACKOFF_MS: 2000,  // Retry delay when the server sends no Retry-After, doubled per attempt
+    VALIDATION_MAX_BACKOFF_MS: 60000,
+    // Inconclusive results that may still turn deliverable: held aside and validated again later
+    DEFERRED_REASONS: [
+        'Greylisted – retry scheduled',
+        'Greylisted – possibly valid',
+        'SMTP unreachable – possibly valid',
+        'DNS lookup failed – possibly valid',
+    ],
+    DEFERRED_RECHECK_DELAYS_MS: [360000, 600000],  // After the server's first greylist re-probe, then once cached results expire
+    // Mirrors the server's format check so one malformed row can't reject a whole batch
+    EMAIL_FORMAT: /^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$/,
+
     async populateSenderAccounts() {
         const select = document.getElementById('sender-account');
         if (!select) {
@@ -250,8 +265,14 @@ const Campaign = {
             sendButton.innerHTML = `<div class="lds-dual-ring"></div><span>Sending...</span>`;
             const logContainer = document.getElementById('sending-log');
             logContainer.innerHTML = '';
-            let sentCount = 0, failCount = 0;
+            let sentCount = 0, failCount = 0, skippedCount = 0;
+            const heldBack = [];
             const totalRecipients = AppState.currentState.recipients.length;
+            const updateProgress = () => {
+                const done = sentCount + failCount + skippedCount + heldBack.length;
+                document.getElementById('progress-text').textContent = `Processed ${done} of ${totalRecipients}...`;
+                document.getElementById('progress-bar').style.width = `${(done / totalRecipients) * 100}%`;
+            };
 
             const logMessage = (message, color = 'text-gray-400') => {
                 logContainer.innerHTML += `<p><span class="text-gray-500">${new Date().toLocaleTimeString()}:</span> <span class="${color}">${message}</span></p>`;
@@ -280,10 +301,25 @@ const Campaign = {
             logMessage(`Starting campaign from ${AppState.currentState.sender.email} using template "${AppState.currentState.template.name}"...`);
             logMessage(`Template type: ${AppState.currentState.template.sendgrid_template_id ? 'SendGrid' : 'Custom HTML'}`);
 
-            for (let i = 0; i < totalRecipients; i++) {
-                const recipient = AppState.currentState.recipients[i];
-                document.getElementById('progress-text').textContent = `Sending ${i + 1} of ${totalRecipients}...`;
+            const validate = document.getElementById('validate-recipients')?.checked;
+            if (validate) logMessage('Validating recipients - only deliverable addresses will be sent to.');
 
+            const onSkipped = (recipient, reason) => {
+                logMessage(`SKIPPED: ${recipient.email} is undeliverable (${reason}).`, 'text-yellow-400');
+                skippedCount++;
+                updateProgress();
+            };
+            const onHeldBack = (recipient, reason) => {
+                logMessage(`HELD BACK: ${recipient.email} was not sent (${reason}).`, 'text-yellow-400');
+                heldBack.push(recipient);
+                updateProgress();
+            };
+            const onNotice = message => logMessage(message, 'text-blue-400');
+            const recipients = validate ?
+                Campaign.deliverableRecipients(AppState.currentState.recipients, { onSkipped, onHeldBack, onNotice }) :
+                AppState.currentState.recipients;
+
+            for await (const recipient of recipients) {
                 try {
                     // Validate recipient data
                     if (!recipient.email || !recipient.email.includes('@')) {
@@ -307,7 +343,8 @@ const Campaign = {
                             AppState.currentState.sender.email,
                             recipient.email,
                             AppState.currentState.template.subject,
-                            `SendGrid Template: ${AppState.currentState.template.sendgrid_template_id}\n\nDynamic Data: ${JSON.stringify(dynamicData)}`
+                            `SendGrid Template: ${AppState.currentState.template.sendgrid_template_id}\n\nDynamic Data: ${JSON.stringify(dynamicData)}`,
+                            { validateRecipient: validate }
                         );
                     } else {
                         // For custom HTML templates, fill on frontend
@@ -329,7 +366,8 @@ const Campaign = {
                             AppState.currentState.sender.email,
                             recipient.email,
                             subject,
-                            body
+                            body,
+                            { validateRecipient: validate }
                         );
                     }
 
@@ -342,16 +380,20 @@ const Campaign = {
                     failCount++;
                 }
 
-                document.getElementById('progress-bar').style.width = `${((i + 1) / totalRecipients) * 100}%`;
+                updateProgress();
 
                 // Add small delay to prevent overwhelming the server
                 await new Promise(resolve => setTimeout(resolve, 100));
             }
 
-            logMessage(`Campaign finished! Sent: ${sentCount}, Failed: ${failCount}`, sentCount > 0 ? 'text-green-400' : 'text-red-400');
+            // Kept so held-back rows can be sent later, once they validate
+            AppState.currentState.heldBackRecipients = heldBack;
+            logMessage(`Campaign finished! Sent: ${sentCount}, Failed: ${failCount}, Skipped: ${skippedCount}, Held back: ${heldBack.length}`, sentCount > 0 ? 'text-green-400' : 'text-red-400');
             document.getElementById('campaign-complete').classList.remove('hidden');
             document.getElementById('final-sent-count').textContent = sentCount;
             document.getElementById('final-fail-count').textContent = failCount;
+            document.getElementById('final-skipped-count').textContent = skippedCount;
+            document.getElementById('final-held-back-count').textContent = heldBack.length;
 
             // Show completion notification
             if (sentCount > 0) {
@@ -371,6 +413,109 @@ const Campaign = {
         }
     },
 
+    // Yields recipients whose address validated as deliverable, in the order results arrive.
+    // Batches stream through /email/validate/stream while earlier rows are already being
+    // sent, so validation overlaps with sending instead of running as a separate step.
+    // Every row ends up yielded, skipped (undeliverable) or held back: rows whose batch
+    // couldn't be validated, and deferred rows (greylisted, unreachable) still inconclusive
+    // after DEFERRED_RECHECK_DELAYS_MS. Saturation (429) is retried after Retry-After
+    async *deliverableRecipients(recipients, { onSkipped, onHeldBack, onNotice }) {
+        const ready = [];
+        let wake = null;
+        let finished = false;
+        let failure = null;
+        const notify = () => {
+            if (wake) {
+                wake();
+                wake = null;
+            }
+        };
+        const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+        // Validates rows, retrying those left without a result; returns the deferred ones
+        const validateBatch = async (batch) => {
+            const deferred = [];
+            let pending = batch;
+            for (let attempt = 1; pending.length; attempt++) {
+                const answered = new Set();
+                try {
+                    const rows = pending;
+                    await API.validateEmailsStream(rows.map(r => r.email), result => {
+                        if (result.index === undefined) return;  // Continuation line, not a result
+                        const recipient = rows[result.index];
+                        answered.add(recipient);
+                        recipient.validation = result;
+                        if (result.deliverable) {
+                            ready.push(recipient);
+                            notify();
+                        } else if (result.valid && Campaign.DEFERRED_REASONS.includes(result.reason)) {
+                            deferred.push(recipient);
+                        } else {
+                            onSkipped(recipient, result.reason);
+                        }
+                    });
+                    pending = pending.filter(recipient => !answered.has(recipient));
+                    if (pending.length === 0) break;
+                    throw new Error('Validation stream ended early');
+                } catch (error) {
+                    pending = pending.filter(recipient => !answered.has(recipient));
+                    if (error.status === 401) throw error;
+                    if (attempt >= Campaign.VALIDATION_MAX_ATTEMPTS || (error.status && error.status !== 429 && error.status < 500)) {
+                        pending.forEach(recipient => onHeldBack(recipient, `not validated: ${error.message}`));
+                        break;
+                    }
+                    const delay = error.retryAfter ? error.retryAfter * 1000 :
+                        Math.min(Campaign.VALIDATION_BACKOFF_MS * 2 ** (attempt - 1), Campaign.VALIDATION_MAX_BACKOFF_MS);
+                    onNotice(`Validation ${error.status === 429 ? 'busy' : 'interrupted'} (${error.message}); retrying ${pending.length} recipients in ${Math.round(delay / 1000)}s.`);
+                    await sleep(delay);
+                }
+            }
+            return deferred;
+        };
+
+        const validation = (async () => {
+            let deferred = [];
+            for (let start = 0; start < recipients.length; start += Campaign.VALIDATION_BATCH_SIZE) {
+                const batch = [];
+                recipients.slice(start, start + Campaign.VALIDATION_BATCH_SIZE).forEach(recipient => {
+                    if (recipient.email.length <= 254 && Campaign.EMAIL_FORMAT.test(recipient.email)) {
+                        batch.push(recipient);
+                    } else {
+                        onSkipped(recipient, 'Invalid Format');
+                    }
+                });
+                if (batch.length) deferred.push(...await validateBatch(batch));
+            }
+
+            for (const delay of Campaign.DEFERRED_RECHECK_DELAYS_MS) {
+                if (deferred.length === 0) break;
+                onNotice(`${deferred.length} recipients had inconclusive results; checking them again in ${Math.round(delay / 60000)} minutes.`);
+                await sleep(delay);
+                const rechecked = [];
+                for (let start = 0; start < deferred.length; start += Campaign.VALIDATION_BATCH_SIZE) {
+                    rechecked.push(...await validateBatch(deferred.slice(start, start + Campaign.VALIDATION_BATCH_SIZE)));
+                }
+                deferred = rechecked;
+            }
+            deferred.forEach(recipient => onHeldBack(recipient, `still inconclusive: ${recipient.validation.reason}`));
+        })().catch(error => {
+            failure = error;
+        }).finally(() => {
+            finished = true;
+            notify();
+        });
+
+        while (ready.length || !finished) {
+            if (ready.length) {
+                yield ready.shift();
+            } else {
+                await new Promise(resolve => { wake = resolve; });
+            }
+        }
+        await validation;
+        if (failure) throw new Error(`Recipient validation failed: ${failure.message}`);
+    },
+
     reset() {
         Object.assign(AppState.currentState, { currentStep: 1, sender: null, template: null, recipients: [] });
         document.getElementById('recipient-input').value = '';
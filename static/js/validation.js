@@ -206,7 +206,15 @@ const Validation = {
             // Step 2: Server-side validation for valid emails only
             let serverResults = [];
             if (validEmails.length > 0) {
-                serverResults = await this.validateEmailsServer(validEmails);
+                let lastRender = 0;
+                serverResults = await this.validateEmailsServer(validEmails, (partialResults) => {
+                    // Re-render at most twice a second while results stream in
+                    const now = Date.now();
+                    if (now - lastRender >= 500) {
+                        lastRender = now;
+                        this.displayResults(this.combineResults(clientResults, partialResults));
+                    }
+                });
             }
 
             // Step 3: Combine results
@@ -233,46 +241,39 @@ const Validation = {
         }
     },
 
-    // Ultra-fast server validation with smart batching
-    async validateEmailsServer(emails) {
-        const batchSize = 50; // Much larger batches
+    // Streaming server validation - results render progressively as the server resolves them
+    async validateEmailsServer(emails, onPartialResults = null) {
+        const requestSize = 1000; // Server limit per request
         const results = [];
-        const batches = [];
-
-        // Create batches
-        for (let i = 0; i < emails.length; i += batchSize) {
-            batches.push(emails.slice(i, i + batchSize));
-        }
+        let processed = 0;
+
+        for (let i = 0; i < emails.length; i += requestSize) {
+            const chunk = emails.slice(i, i + requestSize);
+            const received = new Set();
+            try {
+                await API.validateEmailsStream(chunk, (result) => {
+                    received.add(result.index);
+                    results.push(result);
+                    processed++;
+                    this.performance.processedEmails = processed;
+                    this.updateProgress(processed, emails.length, `Validated ${processed.toLocaleString()} of ${emails.length.toLocaleString()}`);
+                    if (onPartialResults) onPartialResults(results);
+                });
+            } catch (error) {
+                console.error(`Streaming validation failed for emails ${i + 1}-${i + chunk.length}:`, error);
+            }
 
-        // Process batches in parallel (up to 3 concurrent)
-        const concurrentLimit = 3;
-        for (let i = 0; i < batches.length; i += concurrentLimit) {
-            const batchPromises = batches.slice(i, i + concurrentLimit).map(async (batch, batchIndex) => {
-                const globalBatchIndex = i + batchIndex;
-                try {
-                    this.updateProgress(
-                        Math.floor((globalBatchIndex * batchSize + batch.length) / emails.length * 50) + 50,
-                        emails.length,
-                        `Processing batch ${globalBatchIndex + 1}/${batches.length}`
-                    );
-
-                    const response = await API.validateEmails(batch);
-                    this.updateProgress(0, 0, `Processing batch ${globalBatchIndex + 1}/${batches.length}`);
-                    return response.results || [];
-                } catch (error) {
-                    console.error(`Batch ${globalBatchIndex + 1} failed:`, error);
-                    // Return failed results for this batch
-                    return batch.map(email => ({
+            // Anything the stream didn't deliver is reported as a server error
+            chunk.forEach((email, index) => {
+                if (!received.has(index)) {
+                    results.push({
                         email: email,
                         valid: false,
                         deliverable: false,
                         reason: 'Server error - try again'
-                    }));
+                    });
                 }
             });
-
-            const batchResults = await Promise.all(batchPromises);
-            results.push(...batchResults.flat());
         }
 
         return results;
@@ -289,7 +290,9 @@ const Validation = {
                     ...clientResult,
                     valid: serverResult.valid,
                     deliverable: serverResult.deliverable || false,
-                    reason: serverResult.deliverable ? 'Deliverable' : serverResult.reason || clientResult.reason
+                    reason: serverResult.suggestion
+                        ? `Did you mean ${serverResult.suggestion}?`
+                        : serverResult.deliverable ? 'Deliverable' : serverResult.reason || clientResult.reason
                 };
             }
 
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Address Store Test
+
+Fills an AddressStore with a large synthetic list, records outcomes for it and checks that
+rows round-trip, outcome filtering and counts agree, and memory stays near 30 bytes per
+address.
+"""
+
+from address_store import DELIVERABLE, INVALID, UNCHECKED, UNDELIVERABLE, AddressStore
+
+ROWS = 200_000
+DOMAINS = ["gmail.com", "example.org", "mail.example.net", "bücher.example"]
+
+
+def synthetic_email(i):
+    return f"user.{i}@{DOMAINS[i % len(DOMAINS)]}"
+
+
+def test_rows_round_trip():
+    store = AddressStore(synthetic_email(i) for i in range(ROWS))
+    assert len(store) == ROWS
+    assert store.email(0) == "user.0@gmail.com"
+    assert store.email(ROWS - 1) == synthetic_email(ROWS - 1)
+    assert list(store.iter_emails(10, 13)) == [synthetic_email(i) for i in range(10, 13)]
+    assert store.counts()["unchecked"] == ROWS
+    assert store.outcome(5) == UNCHECKED and store.reason(5) is None
+    print(f"{ROWS} rows round-trip")
+
+
+def test_outcomes():
+    store = AddressStore(synthetic_email(i) for i in range(ROWS))
+    for i in range(ROWS):
+        if i % 3 == 0:
+            store.set_result(i, True, True, "Mailbox Verified")
+        elif i % 3 == 1:
+            store.set_result(i, True, False, "Domain Valid (Catch-all)")
+        else:
+            store.set_result(i, False, False, "Mailbox Not Found")
+
+    # A later result (e.g. a greylist retry) replaces the row's outcome in place
+    store.set_result(2, True, True, "Mailbox Verified")
+    assert store.outcome(2) == DELIVERABLE and store.reason(2) == "Mailbox Verified"
+
+    counts = store.counts()
+    expected = {"unchecked": 0, "deliverable": 0, "undeliverable": 0, "invalid": 0}
+    for i in range(ROWS):
+        expected["deliverable" if i % 3 == 0 or i == 2 else "undeliverable" if i % 3 == 1 else "invalid"] += 1
+    assert counts == expected, counts
+    assert sum(1 for _ in store.iter_rows(outcome=INVALID)) == counts["invalid"]
+    index, email, outcome, reason = next(store.iter_rows(outcome=UNDELIVERABLE))
+    assert (index, email, outcome, reason) == (1, synthetic_email(1), UNDELIVERABLE, "Domain Valid (Catch-all)")
+    print(f"Outcome counts: {counts}")
+
+
+def test_memory_per_address():
+    store = AddressStore(synthetic_email(i) for i in range(ROWS))
+    per_address = store.nbytes() / ROWS
+    assert per_address < 32, per_address
+    print(f"{per_address:.1f} bytes per address")
+
+
+if __name__ == "__main__":
+    print("ADDRESS STORE TEST")
+    print("=" * 60)
+    test_rows_round_trip()
+    test_outcomes()
+    test_memory_per_address()
+    print("=" * 60)
+    print("All address store checks passed")
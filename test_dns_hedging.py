@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Hedged DNS Resolver Test
+
+Runs against local stub DNS servers (no network access needed): a fast one, a slow one,
+one that drops every query and one that answers SERVFAIL.
+"""
+
+import asyncio
+import time
+
+import dns.message
+import dns.rcode
+import dns.rrset
+
+from async_resolver import HedgedResolver, DNSLookupError
+
+MX_RECORDS = {
+    "example.org.": ["20 mx2.example.org.", "10 mx1.example.org."],
+}
+
+
+class StubDNSServer(asyncio.DatagramProtocol):
+    """UDP DNS server answering MX queries from MX_RECORDS after a fixed delay"""
+
+    def __init__(self, delay=0.0, drop=False, servfail=False):
+        self.delay = delay
+        self.drop = drop
+        self.servfail = servfail
+        self.queries = 0
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.queries += 1
+        if not self.drop:
+            asyncio.get_running_loop().call_later(self.delay, self.answer, data, addr)
+
+    def answer(self, data, addr):
+        query = dns.message.from_wire(data)
+        response = dns.message.make_response(query)
+        name = query.question[0].name.to_text()
+        if self.servfail:
+            response.set_rcode(dns.rcode.SERVFAIL)
+        elif name in MX_RECORDS:
+            response.answer.append(dns.rrset.from_text(name, 300, "IN", "MX", *MX_RECORDS[name]))
+        else:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        self.transport.sendto(response.to_wire(), addr)
+
+
+async def start_stub(**kwargs):
+    transport, server = await asyncio.get_running_loop().create_datagram_endpoint(
+        lambda: StubDNSServer(**kwargs), local_addr=("127.0.0.1", 0)
+    )
+    return server, ("127.0.0.1", transport.get_extra_info("sockname")[1])
+
+
+async def check_fast_answer():
+    fast, fast_address = await start_stub()
+    resolver = HedgedResolver(nameservers=[fast_address], timeout=2.0)
+
+    mx_hosts = await resolver.resolve_mx("example.org")
+    assert mx_hosts == ["mx1.example.org.", "mx2.example.org."], mx_hosts
+    assert await resolver.resolve_mx("missing.example.org") == []
+    print(f"Fast nameserver: MX ordered by preference {mx_hosts}")
+    fast.transport.close()
+
+
+async def check_hedge_to_second_nameserver():
+    slow, slow_address = await start_stub(delay=1.5)
+    fast, fast_address = await start_stub(delay=0.01)
+    resolver = HedgedResolver(nameservers=[slow_address, fast_address], timeout=3.0, default_hedge_delay=0.1)
+
+    started = time.monotonic()
+    mx_hosts = await resolver.resolve_mx("example.org")
+    elapsed = time.monotonic() - started
+    assert mx_hosts[0] == "mx1.example.org."
+    assert elapsed < 0.5, f"hedged lookup took {elapsed:.2f}s"
+    assert slow.queries == 1 and fast.queries == 1
+    assert resolver.stats[slow_address].hedged == 1
+    print(f"Slow primary: hedged to second nameserver, answered in {elapsed * 1000:.0f} ms")
+
+    # The fast server now has latency samples and the slow one none, so it's asked first
+    await resolver.resolve_mx("example.org")
+    assert slow.queries == 1 and fast.queries == 2
+    print("Next lookup went to the nameserver with the better p95")
+    slow.transport.close()
+    fast.transport.close()
+
+
+async def check_dropped_and_failing_nameservers():
+    dropped, dropped_address = await start_stub(drop=True)
+    failing, failing_address = await start_stub(servfail=True)
+    fast, fast_address = await start_stub()
+
+    resolver = HedgedResolver(nameservers=[failing_address, fast_address], timeout=2.0)
+    started = time.monotonic()
+    assert (await resolver.resolve_mx("example.org"))[0] == "mx1.example.org."
+    assert time.monotonic() - started < 0.1, "SERVFAIL should fail over without waiting"
+    assert resolver.stats[failing_address].failures == 1
+    print("SERVFAIL: failed over to the next nameserver immediately")
+
+    resolver = HedgedResolver(nameservers=[dropped_address], timeout=0.3)
+    try:
+        await resolver.resolve_mx("example.org")
+        raise AssertionError("lookup against a dropping nameserver should fail")
+    except DNSLookupError as e:
+        print(f"Dropped queries: failed after the timeout ({e})")
+
+    for server in (dropped, failing, fast):
+        server.transport.close()
+
+
+async def check_hedge_delay_tracks_p95():
+    fast, fast_address = await start_stub(delay=0.05)
+    resolver = HedgedResolver(nameservers=[fast_address], timeout=2.0, default_hedge_delay=0.5)
+    assert resolver.hedge_delay(fast_address) == 0.5
+
+    for _ in range(20):
+        await resolver.resolve_mx("example.org")
+    delay = resolver.hedge_delay(fast_address)
+    assert 0.04 < delay < 0.2, delay
+    print(f"Hedge delay follows the nameserver's p95: {delay * 1000:.0f} ms")
+    fast.transport.close()
+
+
+def test_fast_answer():
+    asyncio.run(check_fast_answer())
+
+
+def test_hedge_to_second_nameserver():
+    asyncio.run(check_hedge_to_second_nameserver())
+
+
+def test_dropped_and_failing_nameservers():
+    asyncio.run(check_dropped_and_failing_nameservers())
+
+
+def test_hedge_delay_tracks_p95():
+    asyncio.run(check_hedge_delay_tracks_p95())
+
+
+if __name__ == "__main__":
+    print("HEDGED DNS RESOLVER TEST")
+    print("=" * 60)
+    test_fast_answer()
+    test_hedge_to_second_nameserver()
+    test_dropped_and_failing_nameservers()
+    test_hedge_delay_tracks_p95()
+    print("=" * 60)
+    print("All hedged DNS checks passed")
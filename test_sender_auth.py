@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Sender Domain Authentication Test
+
+Runs SPF/DKIM/DMARC checks against a local stub DNS server (no network access needed)
+serving TXT records for a few sender domains in different states of configuration.
+"""
+
+import asyncio
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+from async_resolver import HedgedResolver
+from sender_auth import SenderAuthChecker
+from ttl_cache import TTLCache
+
+SOA = "ns.example. hostmaster.example. 1 3600 600 86400 120"
+
+TXT_RECORDS = {
+    # Fully configured: SPF includes SendGrid, DKIM on SendGrid's s1 selector, DMARC reject
+    "good.example.": ['"v=spf1 include:sendgrid.net -all"'],
+    "sendgrid.net.": ['"v=spf1 ip4:167.89.0.0/17 ip4:208.117.48.0/20 ~all"'],
+    "s1._domainkey.good.example.": ['"v=DKIM1; k=rsa; " "p=MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQC"'],
+    "_dmarc.good.example.": ['"v=DMARC1; p=reject; adkim=s"'],
+    # Enforcing DMARC with no DKIM key anywhere - fails alignment
+    "nodkim.example.": ['"v=spf1 include:sendgrid.net ~all"'],
+    "_dmarc.nodkim.example.": ['"v=DMARC1; p=quarantine; pct=50"'],
+    # Nothing published at all
+    "bare.example.": [],
+    # Two SPF records and a subdomain covered by the organizational DMARC record
+    "messy.example.": ['"v=spf1 -all"', '"v=spf1 include:sendgrid.net -all"'],
+    "_dmarc.messy.example.": ['"v=DMARC1; p=none; sp=reject"'],
+    "google._domainkey.news.messy.example.": ['"v=DKIM1; p=MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEA"'],
+    "news.messy.example.": ['"v=spf1 a mx include:sendgrid.net ~all"'],
+}
+
+
+class StubDNSServer(asyncio.DatagramProtocol):
+    """UDP DNS server answering TXT queries from TXT_RECORDS, NXDOMAIN (with SOA) otherwise"""
+
+    def __init__(self):
+        self.queries = []
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        query = dns.message.from_wire(data)
+        response = dns.message.make_response(query)
+        question = query.question[0]
+        name = question.name.to_text()
+        self.queries.append(name)
+        records = TXT_RECORDS.get(name)
+        if records and question.rdtype == dns.rdatatype.TXT:
+            response.answer.append(dns.rrset.from_text(name, 300, "IN", "TXT", *records))
+        else:
+            if records is None:
+                response.set_rcode(dns.rcode.NXDOMAIN)
+            response.authority.append(dns.rrset.from_text("example.", 3600, "IN", "SOA", SOA))
+        self.transport.sendto(response.to_wire(), addr)
+
+
+async def start_checker():
+    transport, server = await asyncio.get_running_loop().create_datagram_endpoint(
+        StubDNSServer, local_addr=("127.0.0.1", 0)
+    )
+    resolver = HedgedResolver(nameservers=[("127.0.0.1", transport.get_extra_info("sockname")[1])], timeout=2.0)
+    cache = TTLCache(max_size=1000)
+    checker = SenderAuthChecker(resolver, cache, service_spf_includes=("sendgrid.net",))
+    return checker, cache, server
+
+
+async def check_configured_domain():
+    checker, cache, server = await start_checker()
+
+    report = await checker.check("good.example")
+    assert report["status"] == "pass", report["issues"]
+    assert report["spf"]["authorizes_service"] is True
+    assert report["spf"]["lookups"] == 1
+    assert report["dkim"]["selectors"] == ["s1"]
+    assert report["dmarc"]["policy"] == "reject" and report["dmarc"]["adkim"] == "s"
+    print(f"good.example: {report['status']} (SPF {report['spf']['record']!r}, DKIM {report['dkim']['selectors']})")
+
+    # Answers are cached with their TTL - a second check sends no queries
+    queries = len(server.queries)
+    await checker.check("good.example")
+    assert len(server.queries) == queries
+    assert cache.stats()["hits"] > 0
+    print(f"Second check answered from cache ({queries} queries total)")
+
+    # Negative answers use the SOA minimum (120s) instead of the record TTL
+    records, ttl = await checker.resolver.resolve_txt("missing.good.example")
+    assert records == [] and ttl == 120
+    server.transport.close()
+
+
+async def check_misconfigured_domains():
+    checker, _, server = await start_checker()
+
+    report = await checker.check("nodkim.example")
+    assert report["status"] == "fail"
+    assert report["dmarc"]["pct"] == 50
+    assert any("fail DMARC alignment" in i["message"] for i in report["issues"])
+    print(f"nodkim.example: {report['status']} - {report['issues'][0]['message']}")
+
+    report = await checker.check("bare.example")
+    assert report["status"] == "warn"
+    assert report["spf"]["status"] == "missing" and report["dmarc"]["status"] == "missing"
+    assert not report["dkim"]["selectors"]
+    print(f"bare.example: {report['status']} - {len(report['issues'])} warnings")
+
+    report = await checker.check("messy.example")
+    assert report["spf"]["status"] == "permerror"
+    print(f"messy.example: SPF {report['spf']['error']}")
+
+    # Subdomain falls back to the organizational DMARC record and its sp= policy
+    report = await checker.check("news.messy.example")
+    assert report["dmarc"]["source"] == "messy.example" and report["dmarc"]["policy"] == "reject"
+    assert report["dkim"]["selectors"] == ["google"]
+    assert report["spf"]["lookups"] == 3
+    assert report["status"] == "pass", report["issues"]
+    print("news.messy.example: inherits sp=reject from messy.example and passes with DKIM")
+    server.transport.close()
+
+
+def test_configured_domain():
+    asyncio.run(check_configured_domain())
+
+
+def test_misconfigured_domains():
+    asyncio.run(check_misconfigured_domains())
+
+
+if __name__ == "__main__":
+    print("SENDER DOMAIN AUTHENTICATION TEST")
+    print("=" * 60)
+    test_configured_domain()
+    test_misconfigured_domains()
+    print("=" * 60)
+    print("All sender authentication checks passed")
@@ -0,0 +1,153 @@
+"""
+Bounded TTL + LRU cache shared by the app's in-memory caches and trackers.
+
+Entries live in an OrderedDict kept in recency order, so get, set and eviction are O(1):
+a full cache drops its least recently used entry instead of sorting everything under
+the lock. Every entry has an expiry (the cache default or a per-entry TTL) and expired
+entries are dropped when touched. get_or_load() gives async callers single-flight
+loading - concurrent misses on one key share a single loader call. The cache supports
+the dict operations the existing module-level dicts were used with.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe mapping with LRU eviction, per-entry TTL and hit/miss counters"""
+
+    def __init__(self, max_size, ttl=None, name=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+        self._entries = OrderedDict()  # key -> (value, expires_at or None)
+        self._lock = threading.Lock()
+        self._loading = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key, now):
+        """Return the live value for key or _MISSING; caller holds the lock"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at = entry
+        if expires_at is not None and now >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            return _MISSING
+        return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key, time.monotonic())
+            if value is _MISSING:
+                return default
+            del self._entries[key]
+            return value
+
+    async def get_or_load(self, key, loader, ttl=None):
+        """Return the cached value or await loader() once for all concurrent callers
+
+        ttl may be a callable taking the loaded value, for values that carry their own
+        lifetime (DNS answers).
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        future = self._loading.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(key, loader, ttl))
+            self._loading[key] = future
+        return await asyncio.shield(future)
+
+    async def _load(self, key, loader, ttl):
+        try:
+            value = await loader()
+            self.set(key, value, ttl(value) if callable(ttl) else ttl)
+            return value
+        finally:
+            self._loading.pop(key, None)
+
+    def items(self):
+        """Snapshot of live (key, value) pairs, least recently used first"""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, value) for key, (value, expires_at) in self._entries.items()
+                    if expires_at is None or now < expires_at]
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        # An entry that expired after the caller saw it still counts as present
+        with self._lock:
+            del self._entries[key]
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key, time.monotonic()) is not _MISSING
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __iter__(self):
+        return iter(self.keys())
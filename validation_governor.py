@@ -0,0 +1,154 @@
+"""
+Process-wide concurrency governor for email validation.
+
+Every request and bulk job shares one ceiling on concurrent DNS lookups and SMTP
+sessions. When a resource is contended, free slots go to the user currently holding
+the fewest, so one large batch can't starve everyone else. Interactive requests are
+admitted against a bound on outstanding addresses and rejected with a retry hint when
+the process is saturated, instead of queueing until latency collapses for everyone.
+"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+
+class ValidationSaturated(Exception):
+    """Raised when a request can't be admitted; retry_after is a hint in seconds"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class FairLimiter:
+    """Counting semaphore that hands freed slots to the waiting user holding the fewest"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.in_use = 0
+        self.user_in_use = {}
+        self._waiters = {}  # user -> deque of futures, in arrival order
+
+    @property
+    def waiting(self):
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def _grant(self, user):
+        self.in_use += 1
+        self.user_in_use[user] = self.user_in_use.get(user, 0) + 1
+
+    def _wake(self):
+        while self.in_use < self.capacity and self._waiters:
+            user = min(self._waiters, key=lambda u: self.user_in_use.get(u, 0))
+            waiters = self._waiters[user]
+            future = waiters.popleft()
+            if not waiters:
+                del self._waiters[user]
+            if future.done():
+                continue
+            self._grant(user)
+            future.set_result(None)
+
+    async def acquire(self, user):
+        if self.in_use < self.capacity and not self._waiters:
+            self._grant(user)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(user, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted just as we were cancelled - pass it on
+                self.release(user)
+            else:
+                future.cancel()
+                waiters = self._waiters.get(user)
+                if waiters is not None and future in waiters:
+                    waiters.remove(future)
+                    if not waiters:
+                        del self._waiters[user]
+            raise
+
+    def release(self, user):
+        self.in_use -= 1
+        remaining = self.user_in_use.get(user, 0) - 1
+        if remaining > 0:
+            self.user_in_use[user] = remaining
+        else:
+            self.user_in_use.pop(user, None)
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, user):
+        await self.acquire(user)
+        try:
+            yield
+        finally:
+            self.release(user)
+
+
+class Admission:
+    """Outstanding-address reservation for one request; release() is idempotent"""
+
+    def __init__(self, governor, user, count):
+        self.governor = governor
+        self.user = user
+        self.count = count
+
+    def release(self, count=None):
+        """Give back count addresses of the reservation, or all of what's left"""
+        count = self.count if count is None else min(count, self.count)
+        if count > 0:
+            self.governor._release_pending(self.user, count)
+            self.count -= count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class ValidationGovernor:
+    """Shared DNS/SMTP limiters plus admission control for interactive validation"""
+
+    def __init__(self, max_dns_lookups, max_smtp_sessions, max_pending, max_pending_per_user, retry_after):
+        self.dns = FairLimiter(max_dns_lookups)
+        self.smtp = FairLimiter(max_smtp_sessions)
+        self.max_pending = max_pending
+        self.max_pending_per_user = max_pending_per_user
+        self.retry_after = retry_after
+        self.pending = 0
+        self.user_pending = {}
+
+    def admit(self, user, count):
+        """Reserve room for count addresses or raise ValidationSaturated"""
+        user_pending = self.user_pending.get(user, 0)
+        if user_pending and user_pending + count > self.max_pending_per_user:
+            raise ValidationSaturated("Too many validations in progress for this user", self.retry_after)
+        if self.pending and self.pending + count > self.max_pending:
+            raise ValidationSaturated("Email validation is at capacity, please retry shortly", self.retry_after)
+
+        self.pending += count
+        self.user_pending[user] = user_pending + count
+        return Admission(self, user, count)
+
+    def _release_pending(self, user, count):
+        self.pending -= count
+        remaining = self.user_pending.get(user, 0) - count
+        if remaining > 0:
+            self.user_pending[user] = remaining
+        else:
+            self.user_pending.pop(user, None)
+
+    def stats(self):
+        return {
+            "dns": {"capacity": self.dns.capacity, "in_use": self.dns.in_use, "waiting": self.dns.waiting},
+            "smtp": {"capacity": self.smtp.capacity, "in_use": self.smtp.in_use, "waiting": self.smtp.waiting},
+            "pending_addresses": self.pending,
+            "max_pending_addresses": self.max_pending,
+            "active_users": len(self.user_pending),
+        }